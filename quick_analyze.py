@@ -14,7 +14,6 @@ Usage:
 
 import sys
 import argparse
-import subprocess
 from pathlib import Path
 from datetime import datetime, timedelta, date
 
@@ -247,7 +246,7 @@ def main():
 
     # Refresh groups cache to ensure all groups are available
     print("  🔄 Refreshing groups cache...")
-    subprocess.run(["wacli", "groups", "refresh"], capture_output=True)
+    client.refresh_groups()
 
     # Find source group
     source_group = find_group_by_name(client, GROUP_NAME)
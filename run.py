@@ -67,7 +67,9 @@ def run_regex_analyzer_on_wacli(python: str, full_sync: bool = False) -> bool:
             print("  ❌ wacli not installed")
             return False
 
-        client = WacliClient()
+        # Authentication check and group lookup follow right away, so
+        # fetch all three concurrently up front
+        client = WacliClient(prewarm=True)
         if not client.is_authenticated():
             print("  ❌ wacli not authenticated. Run 'wacli auth' first.")
             return False
@@ -5,15 +5,27 @@ Supports both text and image analysis.
 """
 
 import json
+import hashlib
+import os
 import subprocess
 import tempfile
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
 
 from .extractor import Event
 
 
+# Extracted events of text-only requests, keyed by prompt + text, so
+# overlapping runs don't ask Gemini about the same messages again
+AI_CACHE_DIR = Path.home() / ".cache" / "whatsapp-sync" / "ai"
+AI_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Gemini CLI calls run at the same time in analyze_messages_with_ai
+AI_MAX_WORKERS = 4
+
+
 EXTRACTION_PROMPT = """Du bist ein Experte für die Analyse von Fußball-Event-Ankündigungen aus WhatsApp-Nachrichten.
 Extrahiere strukturierte Event-Informationen aus dem folgenden Text und/oder Bildern.
 
@@ -166,7 +178,47 @@ def call_gemini_cli(prompt: str, image_paths: list[str] | None = None) -> str |
         return None
 
 
-def extract_events_with_ai(text: str, image_paths: list[str] | None = None, source_date: datetime | None = None) -> list[Event]:
+def _ai_cache_path(prompt: str) -> Path:
+    """Get the cache file for a prompt."""
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    return AI_CACHE_DIR / f"{key}.json"
+
+
+def _load_cached_events(prompt: str) -> list[dict] | None:
+    """Get the cached raw event list for a prompt, or None on a miss."""
+    path = _ai_cache_path(prompt)
+    try:
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)
+        os.utime(path)  # Mark as recently used for eviction
+        return events
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _store_cached_events(prompt: str, events: list[dict]):
+    """Cache the raw event list for a prompt, evicting least recently used files."""
+    try:
+        AI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_ai_cache_path(prompt), 'w', encoding='utf-8') as f:
+            json.dump(events, f, ensure_ascii=False)
+        
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(AI_CACHE_DIR)
+            if entry.name.endswith('.json')
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= AI_CACHE_MAX_BYTES:
+                break
+            os.unlink(path)
+            total -= size
+    except OSError:
+        pass  # Caching is best effort
+
+
+def extract_events_with_ai(text: str, image_paths: list[str] | None = None, source_date: datetime | None = None) -> list[Event] | None:
     """
     Extract events from text and/or images using Gemini AI.
     
@@ -176,7 +228,8 @@ def extract_events_with_ai(text: str, image_paths: list[str] | None = None, sour
         source_date: Optional source timestamp
         
     Returns:
-        List of extracted Event objects
+        List of extracted Event objects, or None if the AI call or its
+        response parsing failed
     """
     if not text and not image_paths:
         return []
@@ -191,36 +244,44 @@ def extract_events_with_ai(text: str, image_paths: list[str] | None = None, sour
         
         prompt = f"{EXTRACTION_PROMPT}\n\nAnalysiere diesen Text:\n\n{text or '(Kein Text, nur Bilder)'}"
         
-        response = call_gemini_cli(prompt, image_paths)
-        if not response:
-            return []
+        # Images are referenced by path only, so only text-only calls are cached
+        raw_events = None if image_paths else _load_cached_events(prompt)
         
-        content = response
-        
-        # Parse JSON response - find JSON in response (might have markdown code blocks)
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            parts = content.split("```")
-            for part in parts:
-                part = part.strip()
-                if part.startswith("{") or part.startswith("["):
-                    content = part
-                    break
-        
-        # Try to find JSON object in response
-        start_idx = content.find("{")
-        if start_idx == -1:
-            print("  No JSON found in response")
-            return []
-        
-        # Find matching closing brace
-        content = content[start_idx:]
+        if raw_events is None:
+            response = call_gemini_cli(prompt, image_paths)
+            if not response:
+                return None
+            
+            content = response
+            
+            # Parse JSON response - find JSON in response (might have markdown code blocks)
+            if "```json" in content:
+                content = content.split("```json")[1].split("```")[0]
+            elif "```" in content:
+                parts = content.split("```")
+                for part in parts:
+                    part = part.strip()
+                    if part.startswith("{") or part.startswith("["):
+                        content = part
+                        break
+            
+            # Try to find JSON object in response
+            start_idx = content.find("{")
+            if start_idx == -1:
+                print("  No JSON found in response")
+                return None
+            
+            # Find matching closing brace
+            content = content[start_idx:]
+            
+            data = json.loads(content.strip())
+            raw_events = data.get("events", [])
+            if not image_paths:
+                _store_cached_events(prompt, raw_events)
         
-        data = json.loads(content.strip())
         events = []
         
-        for i, event_data in enumerate(data.get("events", [])):
+        for i, event_data in enumerate(raw_events):
             # Parse date
             event_date = None
             if event_data.get("date"):
@@ -256,13 +317,13 @@ def extract_events_with_ai(text: str, image_paths: list[str] | None = None, sour
         
     except json.JSONDecodeError as e:
         print(f"  JSON parse error: {e}")
-        return []
+        return None
     except Exception as e:
         print(f"AI extraction error: {e}")
-        return []
+        return None
 
 
-def analyze_messages_with_ai(messages_text: str, image_paths: list[str] | None = None) -> list[Event]:
+def analyze_messages_with_ai(messages_text: str, image_paths: list[str] | None = None) -> tuple[list[Event], bool]:
     """
     Analyze multiple messages at once with AI.
     
@@ -271,7 +332,8 @@ def analyze_messages_with_ai(messages_text: str, image_paths: list[str] | None =
         image_paths: Optional list of image file paths
         
     Returns:
-        List of extracted events
+        Tuple of (extracted events, whether every chunk was analyzed).
+        Events of the chunks that did succeed are returned either way.
     """
     # Split into chunks if too long (max ~6000 chars per request for CLI)
     max_chunk = 6000
@@ -296,22 +358,42 @@ def analyze_messages_with_ai(messages_text: str, image_paths: list[str] | None =
         chunks = [messages_text]
     
     all_events = []
+    complete = True
+    seen: dict[tuple, int] = {}  # Event key -> chunk it was first found in
     
-    # Process first chunk with images (if any)
-    if chunks:
-        print(f"  Processing chunk 1/{len(chunks)} with {len(image_paths or [])} images...")
-        events = extract_events_with_ai(chunks[0], image_paths)
-        all_events.extend(events)
-        print(f"    Found {len(events)} events")
+    # Each chunk is its own Gemini CLI process, so they can run side by side.
+    # The first chunk is sent with the images (if any), the rest text only.
+    print(f"  Processing {len(chunks)} chunks, chunk 1 with {len(image_paths or [])} images...")
+    with ThreadPoolExecutor(max_workers=min(AI_MAX_WORKERS, len(chunks))) as executor:
+        futures = [
+            executor.submit(extract_events_with_ai, chunk, image_paths if i == 0 else None)
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        for i, future in enumerate(futures, 1):
+            events = future.result()
+            if events is None:
+                print(f"    Chunk {i}/{len(chunks)}: failed")
+                complete = False
+                continue
+            print(f"    Chunk {i}/{len(chunks)}: found {len(events)} events")
+            
+            for event in events:
+                # The same announcement can turn up in more than one chunk.
+                # Events of one chunk are always distinct, and without an
+                # organizer there is too little to tell two events apart.
+                if event.date and event.organizer:
+                    key = (event.date, event.organizer, event.time_start, event.location)
+                    if seen.setdefault(key, i) != i:
+                        continue
+                all_events.append(event)
     
-    # Process remaining chunks (text only)
-    for i, chunk in enumerate(chunks[1:], 2):
-        print(f"  Processing chunk {i}/{len(chunks)}...")
-        events = extract_events_with_ai(chunk)
-        all_events.extend(events)
-        print(f"    Found {len(events)} events")
+    # IDs are only unique per chunk (timestamp + index), so renumber
+    stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    for i, event in enumerate(all_events):
+        event.id = f"ai-{stamp}-{i}"
     
-    return all_events
+    return all_events, complete
 
 
 if __name__ == "__main__":
@@ -340,7 +422,7 @@ if __name__ == "__main__":
     print("Testing Gemini CLI extraction...")
     events = extract_events_with_ai(test_text)
     
-    for event in events:
+    for event in events or []:
         print(f"\nEvent: {event.event_type}")
         print(f"  Date: {event.date}")
         print(f"  Time: {event.time_start} - {event.time_end}")
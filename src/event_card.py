@@ -1,10 +1,15 @@
 """Generate event card images from HTML templates."""
 
+import hashlib
 import os
 import tempfile
 from pathlib import Path
 from datetime import date
 
+# Rendered cards, keyed by their HTML; kept to the most recently used files
+CARD_CACHE_DIR = Path.home() / ".cache" / "whatsapp-sync" / "cards"
+CARD_CACHE_MAX_FILES = 200
+
 WEEKDAYS_DE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
 
 # HTML template for event card (double braces {{ }} escape for .format())
@@ -176,55 +181,27 @@ def generate_event_html(event) -> str:
     )
 
 
-def render_event_card(event, output_path: str = None) -> str:
+def render_event_card(event, output_path: str = None, cache: bool = False) -> str:
     """Render an event card to PNG image.
     
     Args:
         event: Event object with date, organizer, etc.
         output_path: Optional path for output image. If None, creates temp file.
+        cache: If True and no output_path is given, return the shared cached
+            image for this card (see CARD_CACHE_DIR). Don't delete it.
         
     Returns:
         Path to the generated PNG image.
     """
-    from playwright.sync_api import sync_playwright
-    
-    html = generate_event_html(event)
-    
-    # Create temp HTML file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False) as f:
-        f.write(html)
-        html_path = f.name
-    
-    try:
-        # Render to image
-        if output_path is None:
-            output_path = tempfile.mktemp(suffix='.png')
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page(viewport={'width': 450, 'height': 600})
-            page.goto(f'file://{html_path}')
-            
-            # Screenshot just the card element
-            card = page.locator('.card')
-            card.screenshot(path=output_path)
-            
-            browser.close()
-        
-        return output_path
-    finally:
-        # Cleanup temp HTML
-        os.unlink(html_path)
+    return _render_html(generate_event_html(event), 600, output_path, cache)
 
 
-def render_week_header(week_start: date, output_path: str = None) -> str:
-    """Render a week header card to PNG image."""
-    from playwright.sync_api import sync_playwright
-    
+def generate_week_header_html(week_start: date) -> str:
+    """Generate HTML for a week header card."""
     week_num = week_start.isocalendar()[1]
     week_end = week_start + __import__('datetime').timedelta(days=6)
     
-    html = f"""
+    return f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -261,20 +238,92 @@ def render_week_header(week_start: date, output_path: str = None) -> str:
     </body>
     </html>
     """
+
+
+def render_week_header(week_start: date, output_path: str = None, cache: bool = False) -> str:
+    """Render a week header card to PNG image (see render_event_card)."""
+    return _render_html(generate_week_header_html(week_start), 200, output_path, cache)
+
+
+def _render_html(html: str, height: int, output_path: str | None, cache: bool) -> str:
+    """Render a card, from the image cache if allowed."""
+    if not cache or output_path is not None:
+        return _screenshot_card(html, height, output_path or tempfile.mktemp(suffix='.png'))
+    
+    # Same HTML renders to the same image, so the HTML is the cache key
+    key = hashlib.blake2b(f"{height}\n{html}".encode(), digest_size=16).hexdigest()
+    cached = CARD_CACHE_DIR / f"{key}.png"
+    try:
+        os.utime(cached)  # Mark as recently used for eviction
+        return str(cached)
+    except FileNotFoundError:
+        pass  # Not rendered yet, or evicted by another process
+    except OSError:
+        return str(cached)  # Readable but not ours to touch
     
+    # Render to a hidden name and move it into place, so a concurrent
+    # render of the same card never sees a half-written image
+    try:
+        CARD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.png', prefix='.', dir=CARD_CACHE_DIR)
+        os.close(fd)
+    except OSError:
+        # Caching is best effort: render to a temp file as without cache
+        return _screenshot_card(html, height, tempfile.mktemp(suffix='.png'))
+    
+    try:
+        _screenshot_card(html, height, tmp_path)
+        os.replace(tmp_path, cached)
+    except OSError:
+        # Could not write to the cache (e.g. disk full)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return _screenshot_card(html, height, tempfile.mktemp(suffix='.png'))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    return str(cached)
+
+
+def evict_card_cache():
+    """
+    Delete the least recently used cached cards beyond CARD_CACHE_MAX_FILES.
+    
+    Call this once the returned card paths are no longer needed, not while
+    renders are still in flight, so no card is deleted before it is used.
+    """
+    try:
+        with os.scandir(CARD_CACHE_DIR) as entries:
+            cards = sorted(
+                (entry.stat().st_mtime, entry.path)
+                for entry in entries
+                if entry.name.endswith('.png') and not entry.name.startswith('.')
+            )
+        for _, path in cards[:-CARD_CACHE_MAX_FILES]:
+            os.unlink(path)
+    except OSError:
+        pass  # Eviction is best effort
+
+
+def _screenshot_card(html: str, height: int, output_path: str) -> str:
+    """Render HTML in a headless browser and screenshot its .card element."""
+    from playwright.sync_api import sync_playwright
+    
+    # Create temp HTML file
     with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False) as f:
         f.write(html)
         html_path = f.name
     
     try:
-        if output_path is None:
-            output_path = tempfile.mktemp(suffix='.png')
-        
         with sync_playwright() as p:
             browser = p.chromium.launch()
-            page = browser.new_page(viewport={'width': 450, 'height': 200})
+            page = browser.new_page(viewport={'width': 450, 'height': height})
             page.goto(f'file://{html_path}')
             
+            # Screenshot just the card element
             card = page.locator('.card')
             card.screenshot(path=output_path)
             
@@ -282,4 +331,5 @@ def render_week_header(week_start: date, output_path: str = None) -> str:
         
         return output_path
     finally:
+        # Cleanup temp HTML
         os.unlink(html_path)
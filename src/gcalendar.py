@@ -28,6 +28,9 @@ TOKEN_FILE = PROJECT_DIR / "data" / "calendar_token.json"
 # Calendar name to use
 CALENDAR_NAME = "Spiele"
 
+# Service built by get_calendar_service, reused for the rest of the process
+_service = None
+
 
 def get_calendar_service():
     """
@@ -37,6 +40,10 @@ def get_calendar_service():
     Returns:
         Google Calendar API service object
     """
+    global _service
+    if _service is not None:
+        return _service
+    
     creds = None
     
     # Load existing token
@@ -64,7 +71,15 @@ def get_calendar_service():
         with open(TOKEN_FILE, 'w') as token:
             token.write(creds.to_json())
     
-    return build('calendar', 'v3', credentials=creds)
+    # Use the discovery document bundled with googleapiclient - no HTTP
+    # fetch, and no lookup in the (unused) discovery cache
+    _service = build(
+        'calendar', 'v3',
+        credentials=creds,
+        static_discovery=True,
+        cache_discovery=False
+    )
+    return _service
 
 
 def find_calendar_id(service, calendar_name: str = CALENDAR_NAME) -> Optional[str]:
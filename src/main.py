@@ -22,7 +22,7 @@ from .summarizer import (
     generate_summary, generate_weekly_digest, generate_daily_digest,
     format_event_full
 )
-from .whatsapp import WacliClient, check_wacli, find_group_by_name, get_sender_phones
+from .whatsapp import WacliClient, check_wacli, find_group_by_name, get_sender_phones, create_lookup_indexes
 from .ai_extractor import extract_events_with_ai, analyze_messages_with_ai
 from .gcalendar import sync_events_to_calendar, list_calendars, CALENDAR_NAME
 
@@ -164,7 +164,9 @@ def sync(ctx, group, limit, full, ai, regex):
         return
     
     try:
-        client = WacliClient()
+        # Authentication check and group lookup follow right away, so
+        # fetch all three concurrently up front
+        client = WacliClient(prewarm=True)
         
         if not client.is_authenticated():
             console.print("[yellow]Not authenticated. Run 'wacli auth' first.[/]")
@@ -256,21 +258,23 @@ def sync(ctx, group, limit, full, ai, regex):
         media_dir.mkdir(parents=True, exist_ok=True)
         
         media_messages = [wm for wm in wacli_messages if wm.has_media and wm.media_type in ('image', 'image/jpeg', 'image/png')]
+        media_paths = {}
         if media_messages:
             console.print(f"  Downloading [cyan]{len(media_messages)}[/] images...")
+            try:
+                # Already downloaded images are reused
+                media_paths = client.download_media_batch(
+                    target_group.jid, [wm.id for wm in media_messages], media_dir
+                )
+            except Exception as e:
+                console.print(f"    [red]✗ Failed: {e}[/]")
+            
             for wm in media_messages:
-                try:
-                    # Check if already downloaded
-                    existing = list(media_dir.glob(f"*{wm.id}*"))
-                    if existing:
-                        image_paths.append(str(existing[0]))
-                    else:
-                        path = client.download_media(target_group.jid, wm.id, media_dir)
-                        if path:
-                            image_paths.append(path)
-                            console.print(f"    ✓ Downloaded: {Path(path).name}")
-                except Exception as e:
-                    console.print(f"    [red]✗ Failed: {wm.id} - {e}[/]")
+                path = media_paths.get(wm.id)
+                if path:
+                    image_paths.append(path)
+                else:
+                    console.print(f"    [red]✗ Failed: {wm.id}[/]")
         
         console.print(f"  [green]{len(image_paths)}[/] images available")
         
@@ -285,11 +289,7 @@ def sync(ctx, group, limit, full, ai, regex):
             console.print(f"\n[bold blue]Running OCR on {len(image_paths)} images...[/]")
             
             # Create mapping from image path to message ID
-            path_to_msg = {}
-            for wm in media_messages:
-                existing = list(media_dir.glob(f"*{wm.id}*"))
-                if existing:
-                    path_to_msg[str(existing[0])] = wm.id
+            path_to_msg = {path: msg_id for msg_id, path in media_paths.items() if path}
             
             for img_path in image_paths:
                 try:
@@ -338,7 +338,7 @@ def sync(ctx, group, limit, full, ai, regex):
                 combined_content += "\n\n--- OCR FROM IMAGES ---\n" + "\n\n".join(ocr_parts)
             
             console.print(f"  Analyzing {len(combined_content)} chars (text only, faster)...")
-            ai_events = analyze_messages_with_ai(combined_content)  # No images, just text
+            ai_events, _ = analyze_messages_with_ai(combined_content)  # No images, just text
             
             ai_added = 0
             for event in ai_events:
@@ -684,6 +684,21 @@ def status(ctx):
         console.print("[yellow]No events in database. Run 'import' or 'sync' to add events.[/]")
 
 
+@cli.command('index-session')
+@click.option('--store', 'store_dir', help='wacli store directory (default: ~/.wacli)')
+def index_session(store_dir):
+    """Add an index to wacli's session.db for faster sender phone lookups.
+    
+    This modifies whatsmeow's database (one extra index, no schema changes).
+    Stop any running wacli sync first.
+    """
+    if create_lookup_indexes(store_dir):
+        console.print("[green]✓ Lookup index created[/]")
+    else:
+        console.print("[red]✗ Could not index session.db (missing, read-only or locked)[/]")
+        sys.exit(1)
+
+
 @cli.command('ai-analyze')
 @click.option('--file', '-f', 'input_file', type=click.Path(exists=True), 
               help='Text file to analyze (default: data/all_content_last_month.txt)')
@@ -721,8 +736,10 @@ def ai_analyze(ctx, input_file, images):
     console.print("\n[bold blue]Sending to AI for analysis...[/]")
     
     try:
-        events = analyze_messages_with_ai(content)
+        events, complete = analyze_messages_with_ai(content)
         console.print(f"  [green]AI extracted {len(events)} events[/]")
+        if not complete:
+            console.print("  [yellow]Some chunks failed, results may be incomplete[/]")
         
         # Add events to database
         added = 0
@@ -756,7 +773,7 @@ def ai_analyze(ctx, input_file, images):
                 console.print(f"    OCR: {len(ocr_text)} chars")
                 
                 # AI extraction
-                events = extract_events_with_ai(ocr_text)
+                events = extract_events_with_ai(ocr_text) or []
                 for event in events:
                     event.id = f"ai-ocr-{img.stem}"
                     if db.add(event):
@@ -3,7 +3,10 @@ OCR module using PaddleOCR for text extraction from images.
 State-of-the-art OCR with German language support.
 """
 
+import bisect
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Suppress PaddleOCR debug output
@@ -22,11 +25,57 @@ try:
 except ImportError:
     HAS_TESSERACT = False
 
-HAS_OCR = HAS_PADDLE_OCR or HAS_TESSERACT
+try:
+    import cv2
+    import fastdeploy as fd
+    HAS_FASTDEPLOY = True
+except ImportError:
+    HAS_FASTDEPLOY = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Set WFA_OCR_DEVICE=gpu to run the PP-OCRv3 models on the GPU via FastDeploy
+OCR_DEVICE = os.environ.get('WFA_OCR_DEVICE', 'cpu').lower()
+# Exported PP-OCRv3 inference models, one subdirectory each: det/, cls/, rec/
+OCR_MODEL_DIR = Path(os.environ.get('WFA_OCR_MODEL_DIR', Path.home() / '.paddleocr' / 'ppocr_v3'))
+USE_GPU_OCR = HAS_FASTDEPLOY and OCR_DEVICE == 'gpu'
+
+HAS_OCR = HAS_PADDLE_OCR or HAS_TESSERACT or USE_GPU_OCR
+
+# Tesseract config for better accuracy:
+# --oem 3: Use best available OCR engine (LSTM neural net)
+# --psm 6: Single uniform block of text (typical single-column flyer, fastest)
+# -c preserve_interword_spaces=1: Keep word spacing
+TESSERACT_CONFIG = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+# --psm 11: Sparse text - find as much text as possible (fallback for scattered layouts)
+TESSERACT_CONFIG_SPARSE = r'--oem 3 --psm 11 -c preserve_interword_spaces=1'
+
+# Longest image edge passed to Tesseract; larger images are scaled down
+MAX_IMAGE_EDGE = 2000
+
+# Results shorter than this trigger the less aggressive retries
+MIN_TEXT_LENGTH = 50
+
+# White space between images stitched into one Tesseract run
+STITCH_PADDING = 40
+# Tallest stitched canvas; Tesseract rejects images above 32767 px
+MAX_STITCH_HEIGHT = 30000
+
+# Worker threads feeding the GPU OCR pipeline
+GPU_OCR_THREADS = 4
 
 # Global PaddleOCR instance (lazy loaded)
 _paddle_ocr = None
 
+# Global FastDeploy pipeline (lazy loaded) and per-thread clones of it
+_fastdeploy_ocr = None
+_fastdeploy_local = threading.local()
+_fastdeploy_lock = threading.Lock()
+
 
 def get_paddle_ocr():
     """Get or create PaddleOCR instance."""
@@ -40,18 +89,96 @@ def get_paddle_ocr():
     return _paddle_ocr
 
 
-def extract_text_paddle(image_path: str | Path) -> str:
+def get_fastdeploy_ocr():
+    """Get or create the GPU FastDeploy PP-OCRv3 pipeline for this thread."""
+    global _fastdeploy_ocr
+    if _fastdeploy_ocr is None:
+        with _fastdeploy_lock:
+            if _fastdeploy_ocr is None:
+                _fastdeploy_ocr = _build_fastdeploy_ocr()
+                _fastdeploy_local.pipeline = _fastdeploy_ocr
+
+    # Pipelines are not thread-safe; clones share the loaded weights
+    if getattr(_fastdeploy_local, 'pipeline', None) is None:
+        _fastdeploy_local.pipeline = _fastdeploy_ocr.clone()
+    return _fastdeploy_local.pipeline
+
+
+def _build_fastdeploy_ocr():
+    """Load the PP-OCRv3 models onto the GPU."""
+    option = fd.RuntimeOption()
+    option.use_gpu(0)
+
+    def model_files(name: str) -> tuple[str, str]:
+        model_dir = OCR_MODEL_DIR / name
+        return str(model_dir / 'inference.pdmodel'), str(model_dir / 'inference.pdiparams')
+
+    det = fd.vision.ocr.DBDetector(*model_files('det'), runtime_option=option)
+    cls = fd.vision.ocr.Classifier(*model_files('cls'), runtime_option=option)
+    rec = fd.vision.ocr.Recognizer(
+        *model_files('rec'), str(OCR_MODEL_DIR / 'rec' / 'label_list.txt'),
+        runtime_option=option
+    )
+    pipeline = fd.vision.ocr.PPOCRv3(det_model=det, cls_model=cls, rec_model=rec)
+    pipeline.cls_batch_size = 8
+    pipeline.rec_batch_size = 8
+    return pipeline
+
+
+def load_image(image_path: str | Path) -> "Image.Image":
     """
-    Extract text from image using PaddleOCR.
+    Decode an image file once so several OCR engines can share it.
 
     Args:
         image_path: Path to image file
 
+    Returns:
+        Decoded RGB PIL image
+    """
+    with Image.open(image_path) as img:
+        return img.convert('RGB')
+
+
+def _to_bgr(image: "str | Path | Image.Image") -> "np.ndarray":
+    """Get a BGR pixel array (OpenCV layout) from a path or decoded image."""
+    if isinstance(image, (str, Path)):
+        # np.fromfile + imdecode also handles non-ASCII paths
+        return cv2.imdecode(np.fromfile(str(image), dtype=np.uint8), cv2.IMREAD_COLOR)
+    return np.ascontiguousarray(np.asarray(image.convert('RGB'))[:, :, ::-1])
+
+
+def extract_text_fastdeploy(image: "str | Path | Image.Image") -> str:
+    """
+    Extract text from image using PP-OCRv3 on the GPU via FastDeploy.
+
+    Args:
+        image: Path to image file or decoded image
+
+    Returns:
+        Extracted text as string
+    """
+    pixels = _to_bgr(image)
+    if pixels is None:
+        return ""
+
+    result = get_fastdeploy_ocr().predict(pixels)
+    return "\n".join(result.text)
+
+
+def extract_text_paddle(image: "str | Path | Image.Image") -> str:
+    """
+    Extract text from image using PaddleOCR.
+
+    Args:
+        image: Path to image file or decoded image
+
     Returns:
         Extracted text as string
     """
     ocr = get_paddle_ocr()
-    result = ocr.ocr(str(image_path), cls=True)
+    # PaddleOCR reads paths itself and takes decoded images as arrays
+    source = str(image) if isinstance(image, (str, Path)) else _to_bgr(image)
+    result = ocr.ocr(source, cls=True)
 
     if not result or not result[0]:
         return ""
@@ -66,72 +193,112 @@ def extract_text_paddle(image_path: str | Path) -> str:
     return "\n".join(lines)
 
 
-def extract_text_tesseract(image_path: str | Path, language: str = 'deu+eng') -> str:
+def binarize_image(img_gray: "Image.Image") -> "Image.Image":
     """
-    Extract text from image using Tesseract OCR.
+    Binarize a grayscale image using percentile normalization.
+
+    Stretches the 10th..90th percentile range to 0..255 and thresholds at
+    the midpoint, so unevenly lit flyers still separate text from background.
 
     Args:
-        image_path: Path to image file
-        language: Tesseract language code(s)
+        img_gray: Grayscale ('L' mode) PIL image
 
     Returns:
-        Extracted text as string
+        Black and white PIL image
     """
-    if not HAS_TESSERACT:
-        return ""
+    if not HAS_NUMPY:
+        # Same percentile stretch, done by PIL
+        stretched = ImageOps.autocontrast(img_gray, cutoff=10)
+        return stretched.point([0] * 129 + [255] * 127, mode='1')
 
-    try:
-        img = Image.open(image_path)
+    arr = np.asarray(img_gray, dtype=np.uint8)
+    lo, hi = np.percentile(arr, (10, 90))
+    norm = (arr - lo) / max(hi - lo, 1) * 255
+    bw = (norm > 128).astype(np.uint8) * 255
+    return Image.fromarray(bw)
 
-        # Convert to RGB if needed
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
 
-        # === Image preprocessing for better OCR accuracy ===
+def preprocess_image(img: "Image.Image") -> tuple["Image.Image", "Image.Image", "Image.Image"]:
+    """
+    Prepare an image for Tesseract.
 
-        # 1. Resize if too small (OCR works better with larger images)
-        min_width = 1000
-        if img.width < min_width:
-            ratio = min_width / img.width
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
+    Args:
+        img: Source PIL image
 
-        # 2. Convert to grayscale for better text detection
-        img_gray = img.convert('L')
+    Returns:
+        Tuple of (resized RGB, enhanced grayscale, binarized) images
+    """
+    # Convert to RGB if needed
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # === Image preprocessing for better OCR accuracy ===
+
+    # 1. Resize if too small (OCR works better with larger images)
+    min_width = 1000
+    if img.width < min_width:
+        ratio = min_width / img.width
+        new_size = (int(img.width * ratio), int(img.height * ratio))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+    # 1b. Downscale huge phone photos - detection cost grows with pixel area
+    # (never below min_width, so long screenshots keep readable text)
+    ratio = max(MAX_IMAGE_EDGE / max(img.width, img.height), min_width / img.width)
+    if ratio < 1:
+        new_size = (int(img.width * ratio), int(img.height * ratio))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+    # 2. Convert to grayscale for better text detection
+    img_gray = img.convert('L')
+
+    # 3. Enhance contrast
+    enhancer = ImageEnhance.Contrast(img_gray)
+    img_gray = enhancer.enhance(2.0)
 
-        # 3. Enhance contrast
-        enhancer = ImageEnhance.Contrast(img_gray)
-        img_gray = enhancer.enhance(2.0)
+    # 4. Enhance sharpness
+    enhancer = ImageEnhance.Sharpness(img_gray)
+    img_gray = enhancer.enhance(2.0)
 
-        # 4. Enhance sharpness
-        enhancer = ImageEnhance.Sharpness(img_gray)
-        img_gray = enhancer.enhance(2.0)
+    # 5. Apply slight denoise filter
+    img_gray = img_gray.filter(ImageFilter.MedianFilter(size=3))
+
+    # 6. Binarize (convert to black and white) using adaptive threshold
+    # This helps with colorful tournament flyers
+    img_bw = binarize_image(img_gray)
+
+    return img, img_gray, img_bw
+
+
+def extract_text_tesseract(image: "str | Path | Image.Image", language: str = 'deu+eng') -> str:
+    """
+    Extract text from image using Tesseract OCR.
 
-        # 5. Apply slight denoise filter
-        img_gray = img_gray.filter(ImageFilter.MedianFilter(size=3))
+    Args:
+        image: Path to image file or decoded image
+        language: Tesseract language code(s)
 
-        # 6. Binarize (convert to black and white) using adaptive threshold
-        # This helps with colorful tournament flyers
-        threshold = 140
-        img_bw = img_gray.point(lambda x: 255 if x > threshold else 0, mode='1')
+    Returns:
+        Extracted text as string
+    """
+    if not HAS_TESSERACT:
+        return ""
 
-        # Tesseract config for better accuracy:
-        # --oem 3: Use best available OCR engine (LSTM neural net)
-        # --psm 11: Sparse text - find as much text as possible (good for flyers)
-        # -c preserve_interword_spaces=1: Keep word spacing
-        custom_config = r'--oem 3 --psm 11 -c preserve_interword_spaces=1'
+    try:
+        if isinstance(image, (str, Path)):
+            image = Image.open(image)
+        img, img_gray, img_bw = preprocess_image(image)
 
         # Try with preprocessed image first
-        text = pytesseract.image_to_string(img_bw, lang=language, config=custom_config)
+        text = pytesseract.image_to_string(img_bw, lang=language, config=TESSERACT_CONFIG)
 
-        # If result is too short, try with grayscale (less aggressive)
-        if len(text.strip()) < 50:
-            text_gray = pytesseract.image_to_string(img_gray, lang=language, config=custom_config)
+        # If result is too short, try sparse text on grayscale (less aggressive)
+        if len(text.strip()) < MIN_TEXT_LENGTH:
+            text_gray = pytesseract.image_to_string(img_gray, lang=language, config=TESSERACT_CONFIG_SPARSE)
             if len(text_gray.strip()) > len(text.strip()):
                 text = text_gray
 
         # If still short, try original with PSM 3 (auto page segmentation)
-        if len(text.strip()) < 50:
+        if len(text.strip()) < MIN_TEXT_LENGTH:
             config_auto = r'--oem 3 --psm 3'
             text_orig = pytesseract.image_to_string(img, lang=language, config=config_auto)
             if len(text_orig.strip()) > len(text.strip()):
@@ -144,6 +311,114 @@ def extract_text_tesseract(image_path: str | Path, language: str = 'deu+eng') ->
         return ""
 
 
+def _ocr_stitched(images: list["Image.Image"], language: str) -> list[str]:
+    """
+    Run Tesseract once over images stacked vertically on a white canvas.
+
+    Recognized lines are assigned back to their source image by vertical
+    position, so the result has one text per input image.
+
+    Unlike extract_text_tesseract, this reads word boxes with sparse
+    segmentation (psm 11) and rebuilds each line by joining its words with
+    single spaces, so the text can differ in layout from the single-image
+    path for the same picture.
+    """
+    width = max(img.width for img in images)
+    height = sum(img.height for img in images) + STITCH_PADDING * (len(images) - 1)
+    canvas = Image.new('L', (width, height), 255)
+
+    offsets = []
+    y = 0
+    for img in images:
+        canvas.paste(img, (0, y))
+        offsets.append(y)
+        y += img.height + STITCH_PADDING
+
+    data = pytesseract.image_to_data(
+        canvas, lang=language, config=TESSERACT_CONFIG_SPARSE, output_type=pytesseract.Output.DICT
+    )
+
+    # Per image: (block, paragraph, line) -> words, in Tesseract's reading order
+    image_lines: list[dict[tuple, list[str]]] = [{} for _ in images]
+    for word, top, word_height, block, par, line in zip(
+        data['text'], data['top'], data['height'],
+        data['block_num'], data['par_num'], data['line_num']
+    ):
+        if not word.strip():
+            continue
+        index = bisect.bisect_right(offsets, top + word_height // 2) - 1
+        image_lines[index].setdefault((block, par, line), []).append(word)
+
+    return [
+        "\n".join(" ".join(words) for words in lines.values())
+        for lines in image_lines
+    ]
+
+
+def extract_text_tesseract_batch(
+    image_paths: list[str | Path],
+    language: str = 'deu+eng',
+    batch_size: int = 8
+) -> list[str]:
+    """
+    Extract text from several images with one Tesseract run per batch.
+
+    Images that come back with too little text are retried one by one
+    with the full fallback chain of extract_text_tesseract. Text that
+    comes from the stitched run is laid out differently from
+    extract_text_tesseract (see _ocr_stitched).
+
+    Args:
+        image_paths: List of image file paths
+        language: Tesseract language code(s)
+        batch_size: Maximum number of images stitched into one run (batches
+            are also split to keep the canvas below MAX_STITCH_HEIGHT)
+
+    Returns:
+        Extracted text per image, in input order
+    """
+    if not HAS_TESSERACT:
+        return [""] * len(image_paths)
+
+    texts = [""] * len(image_paths)
+    prepared = []
+    for i, path in enumerate(image_paths):
+        try:
+            image = load_image(path)
+            img_bw = preprocess_image(image)[2]
+            prepared.append((i, image, img_bw.convert('L')))
+        except Exception as e:
+            print(f"Tesseract error: {e}")
+
+    # Split by image count and by canvas height
+    batches = []
+    batch, height = [], 0
+    for item in prepared:
+        item_height = item[2].height + STITCH_PADDING
+        if batch and (len(batch) == batch_size or height + item_height > MAX_STITCH_HEIGHT):
+            batches.append(batch)
+            batch, height = [], 0
+        batch.append(item)
+        height += item_height
+    if batch:
+        batches.append(batch)
+
+    for batch in batches:
+        try:
+            batch_texts = _ocr_stitched([img_bw for _, _, img_bw in batch], language)
+        except Exception as e:
+            print(f"Tesseract error: {e}")
+            batch_texts = [""] * len(batch)
+
+        # Retries reuse the already decoded image
+        for (i, image, _), text in zip(batch, batch_texts):
+            if len(text.strip()) < MIN_TEXT_LENGTH:
+                text = extract_text_tesseract(image, language)
+            texts[i] = text
+
+    return texts
+
+
 def extract_text_from_image(image_path: str | Path, language: str = 'deu+eng') -> str:
     """
     Extract text from image using best available OCR.
@@ -155,13 +430,29 @@ def extract_text_from_image(image_path: str | Path, language: str = 'deu+eng') -
     Returns:
         Extracted text as string
     """
+    # Decode once so a fallback engine does not read the file again
+    image = image_path
+    if HAS_TESSERACT:
+        try:
+            image = load_image(image_path)
+        except Exception as e:
+            print(f"Image decode error: {e}")
+            return ""
+
+    # GPU pipeline only when explicitly enabled via WFA_OCR_DEVICE=gpu
+    if USE_GPU_OCR:
+        try:
+            return extract_text_fastdeploy(image)
+        except Exception as e:
+            print(f"FastDeploy error: {e}")
+
     # Use Tesseract as primary (more reliable, PaddleOCR has CPU compatibility issues)
     if HAS_TESSERACT:
-        return extract_text_tesseract(image_path, language)
+        return extract_text_tesseract(image, language)
 
     if HAS_PADDLE_OCR:
         try:
-            return extract_text_paddle(image_path)
+            return extract_text_paddle(image)
         except Exception as e:
             print(f"PaddleOCR error: {e}")
 
@@ -178,9 +469,19 @@ def extract_text_from_images(image_paths: list[str | Path]) -> str:
     Returns:
         Combined text from all images
     """
+    if USE_GPU_OCR:
+        # Keep the GPU busy from several threads, each with its own pipeline clone
+        with ThreadPoolExecutor(max_workers=GPU_OCR_THREADS) as executor:
+            extracted = list(executor.map(extract_text_from_image, image_paths))
+    # Tesseract is started once per batch instead of once per image
+    # (stitched text is laid out slightly differently, see _ocr_stitched)
+    elif HAS_TESSERACT:
+        extracted = extract_text_tesseract_batch(image_paths)
+    else:
+        extracted = [extract_text_from_image(path) for path in image_paths]
+
     texts = []
-    for path in image_paths:
-        text = extract_text_from_image(path)
+    for path, text in zip(image_paths, extracted):
         if text:
             texts.append(f"--- Image: {Path(path).name} ---\n{text}")
 
@@ -202,6 +503,7 @@ def check_ocr() -> dict:
     """Check available OCR engines."""
     return {
         "paddleocr": HAS_PADDLE_OCR,
+        "fastdeploy_gpu": USE_GPU_OCR,
         "tesseract": check_tesseract() if HAS_TESSERACT else False,
         "any": HAS_OCR
     }
@@ -3,14 +3,16 @@ Message parser for WhatsApp chat exports.
 Handles the format: [HH:MM, M/DD/YYYY] +phone: message
 """
 
+import mmap
 import re
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Iterator
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Represents a single WhatsApp message."""
     timestamp: datetime
@@ -27,51 +29,52 @@ class Message:
 # Pattern for WhatsApp export format: [HH:MM, M/DD/YYYY] +phone: message
 # Also handles: [HH:MM, DD/MM/YYYY] and [HH:MM, DD.MM.YYYY] formats
 MESSAGE_PATTERN = re.compile(
-    r'^\[(\d{1,2}:\d{2}),\s*(\d{1,2}[/\.]\d{1,2}[/\.]\d{4})\]\s*([^:]+):\s*(.*)$',
+    r'^\[(\d{1,2}:\d{2}),[^\S\n]*(\d{1,2}[/\.]\d{1,2}[/\.]\d{4})\][^\S\n]*([^:\n]+):[^\S\n]*(.*)$',
     re.MULTILINE
 )
 
 # Alternative format: DD/MM/YYYY, HH:MM - +phone: message (WhatsApp export without brackets)
 MESSAGE_PATTERN_ALT = re.compile(
-    r'^(\d{1,2}/\d{1,2}/\d{4}),\s*(\d{1,2}:\d{2})\s*-\s*([^:]+):\s*(.*)$',
+    r'^(\d{1,2}/\d{1,2}/\d{4}),[^\S\n]*(\d{1,2}:\d{2})[^\S\n]*-[^\S\n]*([^:\n]+):[^\S\n]*(.*)$',
     re.MULTILINE
 )
 
-# Pattern for media attachments
-MEDIA_PATTERN = re.compile(r'<?(Medien|Media|Bild|image|video|audio|document).*>?', re.IGNORECASE)
+# Both header formats in one scan (groups 1-4: original format, 5-8: alternative)
+HEADER_PATTERN = re.compile(
+    f"{MESSAGE_PATTERN.pattern}|{MESSAGE_PATTERN_ALT.pattern}",
+    re.MULTILINE
+)
+
+# Byte variant for scanning memory-mapped export files without decoding them first
+HEADER_PATTERN_BYTES = re.compile(HEADER_PATTERN.pattern.encode(), re.MULTILINE)
+
+# Tokens marking media attachments (matched case-insensitively anywhere in the text)
+MEDIA_TOKENS = ('medien', 'media', 'bild', 'image', 'video', 'audio', 'document')
+
+
+def has_media_marker(text: str) -> bool:
+    """Check if message text references a media attachment."""
+    lowered = text.lower()
+    return any(token in lowered for token in MEDIA_TOKENS)
 
 
+@lru_cache(maxsize=4096)
 def parse_timestamp(time_str: str, date_str: str) -> datetime:
     """Parse timestamp from WhatsApp format."""
-    # Normalize separators
-    date_str = date_str.replace('.', '/')
-    
-    # Try different date formats
-    formats = [
-        f"%H:%M {date_str}",  # Will be combined
-    ]
-    
-    combined = f"{time_str} {date_str}"
-    
-    # Try M/DD/YYYY (US format)
-    try:
-        return datetime.strptime(combined, "%H:%M %m/%d/%Y")
-    except ValueError:
-        pass
-    
-    # Try DD/MM/YYYY (EU format)
-    try:
-        return datetime.strptime(combined, "%H:%M %d/%m/%Y")
-    except ValueError:
-        pass
-    
-    # Try YYYY/MM/DD
     try:
-        return datetime.strptime(combined, "%H:%M %Y/%m/%d")
+        hour, minute = map(int, time_str.split(':'))
+        a, b, c = map(int, date_str.replace('.', '/').split('/'))
+        
+        if a > 31:
+            # YYYY/MM/DD
+            return datetime(a, b, c, hour, minute)
+        if a > 12:
+            # DD/MM/YYYY (EU format)
+            return datetime(c, b, a, hour, minute)
+        # M/DD/YYYY (US format) - also the default when ambiguous
+        return datetime(c, a, b, hour, minute)
     except ValueError:
-        pass
-    
-    raise ValueError(f"Could not parse timestamp: {combined}")
+        raise ValueError(f"Could not parse timestamp: {time_str} {date_str}") from None
 
 
 def parse_export_file(file_path: str | Path) -> list[Message]:
@@ -89,10 +92,56 @@ def parse_export_file(file_path: str | Path) -> list[Message]:
     if not file_path.exists():
         raise FileNotFoundError(f"Chat export not found: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # mmap refuses empty files
+    if file_path.stat().st_size == 0:
+        return []
     
-    return parse_export_text(content)
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return list(_iter_parsed(mm))
+
+
+def _iter_parsed(content: str | mmap.mmap) -> Iterator[Message]:
+    """
+    Parse messages from export text or a memory-mapped UTF-8 export.
+    
+    Headers are found with one anchored scan; each message body is the
+    slice up to the next header, so the content is never split into lines.
+    For mapped files only header fields and body slices get decoded.
+    """
+    if isinstance(content, str):
+        headers = HEADER_PATTERN.finditer(content)
+        decode = str
+    else:
+        headers = HEADER_PATTERN_BYTES.finditer(content)
+        decode = lambda value: value.decode('utf-8')
+    
+    match = next(headers, None)
+    
+    while match:
+        next_match = next(headers, None)
+        
+        if match.group(1):
+            time_str, date_str, sender, text = map(decode, match.group(1, 2, 3, 4))
+        else:
+            date_str, time_str, sender, text = map(decode, match.group(5, 6, 7, 8))
+        
+        try:
+            timestamp = parse_timestamp(time_str, date_str)
+        except ValueError:
+            match = next_match
+            continue
+        
+        # Multi-line continuation runs up to the newline before the next header
+        end = next_match.start() - 1 if next_match else len(content)
+        continuation = decode(content[match.end():end])
+        
+        yield Message(
+            timestamp=timestamp,
+            sender=sender.strip(),
+            content=text.strip() + continuation,
+            has_media=has_media_marker(text)
+        )
+        match = next_match
 
 
 def parse_export_text(content: str) -> list[Message]:
@@ -105,68 +154,7 @@ def parse_export_text(content: str) -> list[Message]:
     Returns:
         List of Message objects
     """
-    messages: list[Message] = []
-    current_message: Message | None = None
-    
-    lines = content.split('\n')
-    
-    for line in lines:
-        # Try original format: [HH:MM, DD/MM/YYYY] +phone: message
-        match = MESSAGE_PATTERN.match(line)
-        if match:
-            # Save previous message if exists
-            if current_message:
-                messages.append(current_message)
-            
-            time_str, date_str, sender, text = match.groups()
-            
-            try:
-                timestamp = parse_timestamp(time_str, date_str)
-            except ValueError:
-                continue
-            
-            has_media = bool(MEDIA_PATTERN.search(text))
-            
-            current_message = Message(
-                timestamp=timestamp,
-                sender=sender.strip(),
-                content=text.strip(),
-                has_media=has_media
-            )
-            continue
-        
-        # Try alternative format: DD/MM/YYYY, HH:MM - +phone: message
-        match_alt = MESSAGE_PATTERN_ALT.match(line)
-        if match_alt:
-            if current_message:
-                messages.append(current_message)
-            
-            date_str, time_str, sender, text = match_alt.groups()
-            
-            try:
-                timestamp = parse_timestamp(time_str, date_str)
-            except ValueError:
-                continue
-            
-            has_media = bool(MEDIA_PATTERN.search(text)) or '<Media omitted>' in text
-            
-            current_message = Message(
-                timestamp=timestamp,
-                sender=sender.strip(),
-                content=text.strip(),
-                has_media=has_media
-            )
-            continue
-        
-        # Multi-line message continuation
-        if current_message:
-            current_message.content += '\n' + line
-    
-    # Don't forget the last message
-    if current_message:
-        messages.append(current_message)
-    
-    return messages
+    return list(_iter_parsed(content))
 
 
 def iter_messages(file_path: str | Path) -> Iterator[Message]:
@@ -174,8 +162,16 @@ def iter_messages(file_path: str | Path) -> Iterator[Message]:
     Iterate over messages in a chat export file.
     Memory-efficient for large files.
     """
-    for message in parse_export_file(file_path):
-        yield message
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        raise FileNotFoundError(f"Chat export not found: {file_path}")
+    
+    if file_path.stat().st_size == 0:
+        return
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield from _iter_parsed(mm)
 
 
 if __name__ == "__main__":
@@ -46,16 +46,11 @@ def format_event_short(event: Event) -> str:
     """Format event as a short one-liner."""
     emoji = "🏆" if event.event_type == "tournament" else "⚽"
     
-    date_str = ""
-    if event.date:
-        date_str = f"{event.date.day}.{event.date.month}."
-    
-    parts = [emoji, date_str, event.organizer or "Unbekannt"]
+    date_str = f" {event.date.day}.{event.date.month}." if event.date else ""
     # Removed level_str per user request
-    if event.status == "full":
-        parts.append("❌ VOLL")
+    status_str = " ❌ VOLL" if event.status == "full" else ""
     
-    return " ".join(filter(None, parts))
+    return f"{emoji}{date_str} {event.organizer or 'Unbekannt'}{status_str}"
 
 
 def format_event_full(event: Event) -> str:
@@ -160,6 +155,14 @@ def format_event_compact(event: Event) -> str:
     return "\n".join(lines)
 
 
+# Formatter and trailing spacer lines for each format style
+FORMATTERS = {
+    "short": (format_event_short, ()),
+    "compact": (format_event_compact, ("",)),
+    "full": (format_event_full, ("", "─" * 30, "")),
+}
+
+
 def generate_summary(
     events: list[Event],
     format_style: Literal["short", "compact", "full"] = "compact",
@@ -206,18 +209,11 @@ def generate_summary(
     # Sort by date
     sorted_events = sort_events(events, by="date")
     
-    # Format each event
+    # Format each event (unknown styles fall back to full)
+    formatter, spacer = FORMATTERS.get(format_style, FORMATTERS["full"])
     for event in sorted_events:
-        if format_style == "short":
-            lines.append(format_event_short(event))
-        elif format_style == "compact":
-            lines.append(format_event_compact(event))
-            lines.append("")  # Spacing between events
-        else:  # full
-            lines.append(format_event_full(event))
-            lines.append("")
-            lines.append("─" * 30)
-            lines.append("")
+        lines.append(formatter(event))
+        lines.extend(spacer)
     
     return "\n".join(lines).strip()
 
@@ -3,14 +3,155 @@ WhatsApp CLI (wacli) wrapper.
 Provides Python interface for wacli commands.
 """
 
+import atexit
 import json
+import os
+import re
 import subprocess
 import shutil
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 from typing import Iterator
 
+try:
+    # Several times faster on large message dumps; its JSONDecodeError
+    # subclasses json.JSONDecodeError, so existing handlers still apply
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+
+# Seconds that prewarmed WacliClient results stay valid
+PREWARM_TTL = 5
+
+# Marks a missing cache entry (cached values may be falsy)
+_MISSING = object()
+
+# Everything but digits and '+' in a phone number
+PHONE_JUNK_PATTERN = re.compile(r'[^0-9+]')
+
+# Per-connection settings for session.db lookups. The connection is
+# read-only, so write-side settings (synchronous, journal_mode) don't apply;
+# these keep pages in memory instead of paying a pread per page. mmap_size
+# is set per database in _get_conn.
+SESSION_PRAGMAS = """
+    PRAGMA query_only = 1;
+    PRAGMA cache_size = -65536;
+    PRAGMA temp_store = MEMORY;
+"""
+
+# Read-only session.db connections, opened once per database and reused
+_conn_cache: dict[Path, sqlite3.Connection] = {}
+_conn_lock = threading.Lock()
+
+
+def _get_conn(session_db: Path) -> sqlite3.Connection:
+    """Get the cached read-only connection for a whatsmeow session.db."""
+    with _conn_lock:
+        conn = _conn_cache.get(session_db)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{session_db.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False
+            )
+            conn.executescript(SESSION_PRAGMAS)
+            # Map the whole file, with 1 MiB headroom for growth, so every
+            # page is served from memory without a read() syscall
+            mmap_size = session_db.stat().st_size + (1 << 20)
+            conn.execute(f"PRAGMA mmap_size = {mmap_size}")
+            _conn_cache[session_db] = conn
+        return conn
+
+
+def _close_all():
+    """Close all cached session.db connections."""
+    with _conn_lock:
+        for conn in _conn_cache.values():
+            conn.close()
+        _conn_cache.clear()
+
+
+atexit.register(_close_all)
+
+
+# Optional index for the lookup below (see create_lookup_indexes);
+# message_id is not a leading primary key column, so without it every ID in
+# the lookup scans the whole secrets table
+LOOKUP_INDEXES_SQL = """
+    CREATE INDEX IF NOT EXISTS wfa_ms_message_id
+        ON whatsmeow_message_secrets(message_id);
+"""
+
+# Sender phone lookup in two index-friendly steps: message IDs -> sender
+# JIDs, then LIDs -> phones. Keys are bound as one JSON array each, so the
+# statements have the same shape (and cached plan) for any number of IDs.
+SENDER_JID_QUERY = """
+    SELECT message_id, sender_jid
+    FROM whatsmeow_message_secrets
+    WHERE message_id IN (SELECT value FROM json_each(?))
+"""
+
+LID_PHONE_QUERY = """
+    SELECT lid, pn
+    FROM whatsmeow_lid_map
+    WHERE lid IN (SELECT value FROM json_each(?))
+        AND pn <> ''
+"""
+
+
+def _session_db_path(store_dir: str | None) -> Path:
+    """Get the whatsmeow session.db path for a wacli store directory."""
+    store_path = Path(store_dir) if store_dir else Path.home() / ".wacli"
+    return store_path / "session.db"
+
+
+def create_lookup_indexes(store_dir: str | None = None) -> bool:
+    """
+    Add the index that speeds up get_sender_phones to whatsmeow's session.db.
+    
+    This writes to another application's database, so it is never done
+    implicitly - only when explicitly asked for (`index-session` command).
+    Only an index is added, no columns, so the tables whatsmeow migrates
+    stay untouched. Stop wacli first: this takes a write lock.
+    
+    Returns:
+        True if the index exists afterwards
+    """
+    session_db = _session_db_path(store_dir)
+    if not session_db.exists():
+        return False
+    
+    try:
+        conn = sqlite3.connect(str(session_db), timeout=5)
+        try:
+            conn.executescript(LOOKUP_INDEXES_SQL)
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def prepare_sender_phones(store_dir: str | None = None):
+    """
+    Open session.db ahead of get_sender_phones.
+    
+    Meant to run in a background thread while messages are fetched, so
+    the first lookup doesn't pay for it. Errors are left to the lookup.
+    """
+    session_db = _session_db_path(store_dir)
+    if session_db.exists():
+        try:
+            _get_conn(session_db)
+        except sqlite3.Error:
+            pass
+
 
 def get_sender_phones(message_ids: list[str], store_dir: str | None = None) -> dict[str, str]:
     """
@@ -30,33 +171,24 @@ def get_sender_phones(message_ids: list[str], store_dir: str | None = None) -> d
     if not message_ids:
         return {}
     
-    store_path = Path(store_dir) if store_dir else Path.home() / ".wacli"
-    session_db = store_path / "session.db"
-    
+    session_db = _session_db_path(store_dir)
     if not session_db.exists():
         return {}
     
     try:
-        conn = sqlite3.connect(str(session_db))
-        cursor = conn.cursor()
-        
-        # Build query with placeholders for message IDs
-        placeholders = ",".join("?" * len(message_ids))
-        query = f"""
-            SELECT 
-                ms.message_id,
-                lm.pn as phone
-            FROM whatsmeow_message_secrets ms
-            LEFT JOIN whatsmeow_lid_map lm 
-                ON substr(ms.sender_jid, 1, instr(ms.sender_jid, '@')-1) = lm.lid
-            WHERE ms.message_id IN ({placeholders})
-        """
+        conn = _get_conn(session_db)
+        rows = conn.execute(SENDER_JID_QUERY, (json.dumps(list(message_ids)),)).fetchall()
         
-        cursor.execute(query, message_ids)
-        results = {row[0]: row[1] for row in cursor.fetchall() if row[1]}
+        # Split "lid@lid" in Python rather than per row in SQL, so the
+        # second lookup hits the lid primary key directly
+        senders = [(msg_id, jid.partition('@')[0]) for msg_id, jid in rows]
+        phones = dict(conn.execute(
+            LID_PHONE_QUERY,
+            (json.dumps(list({lid for _, lid in senders})),)
+        ))
         
-        conn.close()
-        return results
+        # Messages without a known phone are left out
+        return {msg_id: phones[lid] for msg_id, lid in senders if lid in phones}
         
     except Exception as e:
         # Silently fail - phone lookup is optional enhancement
@@ -65,12 +197,23 @@ def get_sender_phones(message_ids: list[str], store_dir: str | None = None) -> d
 
 
 
+@cache
+def wacli_path() -> str | None:
+    """Resolve the wacli executable on PATH once per process."""
+    return shutil.which('wacli')
+
+
 def check_wacli() -> bool:
     """Check if wacli is installed and available."""
-    return shutil.which('wacli') is not None
+    return wacli_path() is not None
 
 
-def run_wacli(*args, json_output: bool = False, timeout: int = 60) -> tuple[int, str, str]:
+def run_wacli(
+    *args,
+    json_output: bool = False,
+    timeout: int = 60,
+    capture: bool = True
+) -> tuple[int, str | bytes, str]:
     """
     Run a wacli command.
     
@@ -78,11 +221,16 @@ def run_wacli(*args, json_output: bool = False, timeout: int = 60) -> tuple[int,
         *args: Command arguments
         json_output: Whether to add --json flag
         timeout: Command timeout in seconds
+        capture: Whether to read stdout. Without it, stdout goes straight
+            to /dev/null and comes back empty; stderr is still captured
+            for error messages.
         
     Returns:
-        Tuple of (exit_code, stdout, stderr)
+        Tuple of (exit_code, stdout, stderr). With json_output, stdout is
+        left as raw bytes for the JSON decoder instead of being decoded to str.
     """
-    cmd = ['wacli']
+    # Absolute path skips the PATH search on every exec
+    cmd = [wacli_path() or 'wacli']
     if json_output:
         cmd.append('--json')
     cmd.extend(args)
@@ -90,18 +238,40 @@ def run_wacli(*args, json_output: bool = False, timeout: int = 60) -> tuple[int,
     try:
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=timeout
         )
-        return result.returncode, result.stdout, result.stderr
+        stdout = result.stdout or b""
+        if not json_output:
+            stdout = stdout.decode('utf-8', errors='replace')
+        return result.returncode, stdout, result.stderr.decode('utf-8', errors='replace')
     except subprocess.TimeoutExpired:
-        return -1, "", "Command timed out"
+        return -1, b"" if json_output else "", "Command timed out"
     except FileNotFoundError:
-        return -1, "", "wacli not found. Install from: https://github.com/steipete/wacli"
+        return -1, b"" if json_output else "", "wacli not found. Install from: https://github.com/steipete/wacli"
 
 
-@dataclass
+def _decode_items(stdout: str | bytes, key: str | None = None) -> list[dict]:
+    """
+    Decode a wacli JSON response into its list of items.
+    
+    Handles a bare list as well as the {success, data: [...]} envelope and,
+    with key, {success, data: {key: [...]}}. Anything else yields [].
+    """
+    try:
+        response = _loads(stdout)
+    except json.JSONDecodeError:
+        return []
+    
+    data = response.get('data', response) if isinstance(response, dict) else response
+    if key is not None and isinstance(data, dict):
+        data = data.get(key, [])
+    return data if isinstance(data, list) else []
+
+
+# Frozen: cached listings hand out the same instances to every caller
+@dataclass(slots=True, frozen=True)
 class Chat:
     """Represents a WhatsApp chat."""
     jid: str
@@ -110,14 +280,11 @@ class Chat:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Chat':
-        return cls(
-            jid=data.get('JID', data.get('jid', '')),
-            name=data.get('Name', data.get('name', '')),
-            is_group='@g.us' in data.get('JID', data.get('jid', ''))
-        )
+        jid = data.get('JID', data.get('jid', ''))
+        return cls(jid, data.get('Name', data.get('name', '')), '@g.us' in jid)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WacliMessage:
     """Represents a message from wacli."""
     id: str
@@ -130,7 +297,17 @@ class WacliMessage:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'WacliMessage':
-        # Handle wacli's field naming (MsgID, ChatJID, SenderJID, etc.)
+        # Fast path: wacli's own field naming (MsgID, ChatJID, SenderJID, etc.)
+        try:
+            media_type = data['MediaType']
+            return cls(
+                data['MsgID'], data['ChatJID'], data['SenderJID'], data['Text'],
+                data['Timestamp'], bool(media_type), media_type or None
+            )
+        except KeyError:
+            pass
+        
+        # Mixed or lowercase field naming
         media_type = data.get('MediaType', data.get('media_type', ''))
         return cls(
             id=data.get('MsgID', data.get('ID', data.get('id', ''))),
@@ -146,15 +323,63 @@ class WacliMessage:
 class WacliClient:
     """Python client for wacli commands."""
     
-    def __init__(self, store_dir: str | None = None):
+    def __init__(
+        self,
+        store_dir: str | None = None,
+        prewarm: bool = False
+    ):
         """
         Initialize wacli client.
         
         Args:
             store_dir: Optional custom store directory (default: ~/.wacli)
+            prewarm: Run the usual startup queries concurrently right away
+                (see prewarm())
         """
         self.store_dir = store_dir
         self._check_installation()
+        
+        # Prewarmed results: key -> (expiry, value)
+        self._cache: dict[tuple, tuple[float, object]] = {}
+        
+        # Lowercased group names for find_group_by_name, see group_name_index()
+        self._group_index: list[tuple[str, Chat]] | None = None
+        
+        # Download directories already created by this client
+        self._known_dirs: set[Path] = set()
+        
+        if prewarm:
+            self.prewarm()
+    
+    def prewarm(self):
+        """
+        Run is_authenticated, list_groups and list_chats(limit=200) concurrently.
+        
+        Results are cached for PREWARM_TTL seconds, so the first calls a
+        session makes cost one wait for the slowest instead of the sum.
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                ('doctor',): executor.submit(self.is_authenticated),
+                ('groups',): executor.submit(self.list_groups),
+                ('chats', 200): executor.submit(self.list_chats, limit=200),
+            }
+        
+        expiry = time.monotonic() + PREWARM_TTL
+        for key, future in futures.items():
+            try:
+                self._cache[key] = (expiry, future.result())
+            except Exception:
+                # Prewarming is optional: anything it hits (failed command,
+                # timeout, bad JSON) is left for the real call to report
+                pass
+    
+    def _cached(self, key: tuple) -> object:
+        """Get a fresh prewarmed result, or _MISSING."""
+        entry = self._cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return _MISSING
+        return entry[1]
     
     def _check_installation(self):
         """Verify wacli is installed."""
@@ -163,15 +388,26 @@ class WacliClient:
                 "wacli is not installed. Install from: https://github.com/steipete/wacli"
             )
     
-    def _run(self, *args, json_output: bool = True, timeout: int = 60) -> tuple[int, str, str]:
-        """Run wacli with optional store directory."""
+    def _run(
+        self,
+        *args,
+        json_output: bool = True,
+        timeout: int = 60,
+        capture: bool = True
+    ) -> tuple[int, str | bytes, str]:
+        """Run wacli with optional store directory (see run_wacli for capture)."""
         cmd_args = list(args)
         if self.store_dir:
             cmd_args = ['--store', self.store_dir] + cmd_args
-        return run_wacli(*cmd_args, json_output=json_output, timeout=timeout)
+        
+        return run_wacli(*cmd_args, json_output=json_output, timeout=timeout, capture=capture)
     
     def is_authenticated(self) -> bool:
         """Check if wacli is authenticated."""
+        cached = self._cached(('doctor',))
+        if cached is not _MISSING:
+            return cached
+        
         code, _, _ = self._run('doctor', json_output=False, timeout=10)
         return code == 0
     
@@ -185,37 +421,87 @@ class WacliClient:
         Returns:
             List of Chat objects
         """
+        self._group_index = None
+        cached = self._cached(('chats', limit))
+        if cached is not _MISSING:
+            return cached
+        
         code, stdout, stderr = self._run('chats', 'list', '--limit', str(limit))
         
         if code != 0:
             raise RuntimeError(f"Failed to list chats: {stderr}")
         
-        try:
-            response = json.loads(stdout)
-            # Handle nested response structure
-            data = response.get('data', response) if isinstance(response, dict) else response
-            if isinstance(data, list):
-                return [Chat.from_dict(c) for c in data]
-            return []
-        except json.JSONDecodeError:
-            return []
+        return [Chat.from_dict(c) for c in _decode_items(stdout)]
     
     def list_groups(self) -> list[Chat]:
         """List available groups."""
+        self._group_index = None
+        cached = self._cached(('groups',))
+        if cached is not _MISSING:
+            return cached
+        
         code, stdout, stderr = self._run('groups', 'list')
         
         if code != 0:
             raise RuntimeError(f"Failed to list groups: {stderr}")
         
-        try:
-            response = json.loads(stdout)
-            # Handle nested response structure
-            data = response.get('data', response) if isinstance(response, dict) else response
-            if isinstance(data, list):
-                return [Chat.from_dict(g) for g in data]
-            return []
-        except json.JSONDecodeError:
-            return []
+        return [Chat.from_dict(g) for g in _decode_items(stdout)]
+    
+    def group_name_index(self) -> list[tuple[str, Chat]]:
+        """
+        Get (lowercased name, chat) pairs for groups, then group chats.
+        
+        Built once from concurrent groups/chats listings - both are wacli
+        round-trips - and reused until list_groups or list_chats runs again.
+        """
+        if self._group_index is None:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                groups_future = executor.submit(self.list_groups)
+                chats_future = executor.submit(self.list_chats, limit=200)
+                groups, chats = groups_future.result(), chats_future.result()
+            
+            self._group_index = (
+                [(group.name.lower(), group) for group in groups]
+                + [(chat.name.lower(), chat) for chat in chats if chat.is_group]
+            )
+        return self._group_index
+    
+    def refresh_groups(self, timeout: int = 60) -> bool:
+        """
+        Refresh wacli's group list from WhatsApp.
+        
+        Drops prewarmed listings and the group name index, as both may
+        miss groups the refresh adds.
+        
+        Returns:
+            True if the refresh succeeded
+        """
+        code, _, _ = self._run('groups', 'refresh', json_output=False, timeout=timeout, capture=False)
+        
+        self._group_index = None
+        self._cache.pop(('groups',), None)
+        self._cache.pop(('chats', 200), None)
+        return code == 0
+    
+    def backfill_history(self, chat_jid: str, timeout: int = 60) -> bool:
+        """
+        Fetch older messages of a chat from WhatsApp into wacli's store.
+        
+        Args:
+            chat_jid: Chat JID
+            timeout: Timeout in seconds
+            
+        Returns:
+            True if the backfill succeeded
+        """
+        code, _, _ = self._run(
+            'history', 'backfill',
+            '--chat', chat_jid,
+            json_output=False,
+            timeout=timeout,
+            capture=False
+        )
+        return code == 0
     
     def search_messages(self, query: str, limit: int = 100) -> list[WacliMessage]:
         """
@@ -236,11 +522,7 @@ class WacliClient:
         if code != 0:
             raise RuntimeError(f"Failed to search messages: {stderr}")
         
-        try:
-            data = json.loads(stdout)
-            return [WacliMessage.from_dict(m) for m in data]
-        except json.JSONDecodeError:
-            return []
+        return [WacliMessage.from_dict(m) for m in _decode_items(stdout, 'messages')]
     
     def get_messages(self, chat_jid: str, limit: int = 100) -> list[WacliMessage]:
         """
@@ -262,22 +544,8 @@ class WacliClient:
         if code != 0:
             raise RuntimeError(f"Failed to get messages: {stderr}")
         
-        try:
-            response = json.loads(stdout)
-            # Handle nested response: {success, data: {messages: [...]}}
-            if isinstance(response, dict):
-                data = response.get('data', response)
-                if isinstance(data, dict):
-                    messages = data.get('messages', [])
-                elif isinstance(data, list):
-                    messages = data
-                else:
-                    messages = []
-            else:
-                messages = response if isinstance(response, list) else []
-            return [WacliMessage.from_dict(m) for m in messages]
-        except json.JSONDecodeError:
-            return []
+        # Nested response: {success, data: {messages: [...]}}
+        return [WacliMessage.from_dict(m) for m in _decode_items(stdout, 'messages')]
     
     def send_message(self, to: str, message: str) -> bool:
         """
@@ -293,9 +561,7 @@ class WacliClient:
         # Normalize phone number
         if not '@' in to:
             # Remove non-digits except leading +
-            clean = ''.join(c for c in to if c.isdigit() or c == '+')
-            if clean.startswith('+'):
-                clean = clean[1:]
+            clean = PHONE_JUNK_PATTERN.sub('', to).removeprefix('+')
             to = f"{clean}@s.whatsapp.net"
         
         code, stdout, stderr = self._run(
@@ -303,7 +569,8 @@ class WacliClient:
             '--to', to,
             '--message', message,
             json_output=False,
-            timeout=30
+            timeout=30,
+            capture=False
         )
         
         return code == 0
@@ -324,7 +591,8 @@ class WacliClient:
             '--to', group_jid,
             '--message', message,
             json_output=False,
-            timeout=30
+            timeout=30,
+            capture=False
         )
         
         return code == 0
@@ -353,7 +621,8 @@ class WacliClient:
         code, stdout, stderr = self._run(
             *args,
             json_output=False,
-            timeout=60
+            timeout=60,
+            capture=False
         )
         
         return code == 0
@@ -371,7 +640,9 @@ class WacliClient:
             Path to downloaded file, or None if failed
         """
         output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if output_dir not in self._known_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(output_dir)
         
         code, stdout, stderr = self._run(
             'media', 'download',
@@ -379,18 +650,66 @@ class WacliClient:
             '--id', message_id,
             '--output', str(output_dir),
             json_output=False,
-            timeout=120
+            timeout=120,
+            capture=False
         )
         
         if code == 0:
             # Try to find downloaded file
-            # wacli typically saves with message ID in filename
-            for f in output_dir.iterdir():
-                if message_id in f.name:
-                    return str(f)
+            # wacli typically saves with message ID in filename. scandir
+            # gets names from one directory read without a stat per entry.
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if message_id in entry.name:
+                        return entry.path
         
         return None
     
+    def download_media_batch(
+        self,
+        chat_jid: str,
+        message_ids: list[str],
+        output_dir: str | Path
+    ) -> dict[str, str | None]:
+        """
+        Download media from several messages of one chat.
+        
+        Media already in output_dir is reused instead of downloaded again.
+        Each download still runs its own wacli process, as wacli has no
+        multi-ID download.
+        
+        Args:
+            chat_jid: Chat JID
+            message_ids: Message IDs
+            output_dir: Directory to save media
+            
+        Returns:
+            Dict mapping message_id -> path to the file, or None if failed
+        """
+        output_dir = Path(output_dir)
+        if output_dir not in self._known_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(output_dir)
+        
+        paths = _find_media_files(output_dir, message_ids)
+        missing = [message_id for message_id, path in paths.items() if path is None]
+        
+        for message_id in missing:
+            self._run(
+                'media', 'download',
+                '--chat', chat_jid,
+                '--id', message_id,
+                '--output', str(output_dir),
+                json_output=False,
+                timeout=120,
+                capture=False
+            )
+        
+        # One directory read picks up everything downloaded above
+        if missing:
+            paths.update(_find_media_files(output_dir, missing))
+        return paths
+    
     def sync(self, follow: bool = False, timeout: int = 300) -> bool:
         """
         Sync messages from WhatsApp.
@@ -409,27 +728,32 @@ class WacliClient:
         code, stdout, stderr = self._run(
             *args,
             json_output=False,
-            timeout=timeout if not follow else 5
+            timeout=timeout if not follow else 5,
+            capture=False
         )
         
         # For --follow mode, we expect timeout (process keeps running)
         return code == 0 or (follow and code == -1)
 
 
+def _find_media_files(directory: Path, message_ids: list[str]) -> dict[str, str | None]:
+    """Map each message ID to the first file in directory whose name contains it."""
+    with os.scandir(directory) as entries:
+        files = [(entry.name, entry.path) for entry in entries]
+    
+    return {
+        message_id: next((path for name, path in files if message_id in name), None)
+        for message_id in message_ids
+    }
+
+
 def find_group_by_name(client: WacliClient, name_part: str) -> Chat | None:
     """Find a group by partial name match."""
     name_lower = name_part.lower()
     
-    # Search in groups first
-    groups = client.list_groups()
-    for group in groups:
-        if name_lower in group.name.lower():
-            return group
-    
-    # Also search in chats (some groups appear there)
-    chats = client.list_chats(limit=200)
-    for chat in chats:
-        if chat.is_group and name_lower in chat.name.lower():
+    # Groups first, then group chats (some groups only appear there)
+    for chat_name, chat in client.group_name_index():
+        if name_lower in chat_name:
             return chat
     
     return None
@@ -441,7 +765,7 @@ if __name__ == "__main__":
     
     if check_wacli():
         try:
-            client = WacliClient()
+            client = WacliClient(prewarm=True)
             print(f"Authenticated: {client.is_authenticated()}")
             
             print("\nListing groups...")
@@ -10,12 +10,17 @@ Usage:
     python3 sync_to_calendar.py --dry-run          # Preview only
     python3 sync_to_calendar.py --days 7           # Custom days back
     python3 sync_to_calendar.py --cleanup          # Delete past events
+    python3 sync_to_calendar.py --full             # Re-analyze messages seen before
 """
 
+import json
+import re
 import sys
 import argparse
-import subprocess
+import threading
 from pathlib import Path
+from dataclasses import dataclass
+from itertools import groupby
 from datetime import datetime, timedelta, date
 
 # Project directory
@@ -27,9 +32,40 @@ DEFAULT_GROUP = "Jahrgang 2014er Trainer"
 NOTIFY_GROUP = "Termine"
 DEFAULT_DAYS = 7  # Last week
 CALENDAR_NAME = "Spiele"
+CALENDAR_BATCH_SIZE = 50  # Google API limit is 50 calls per batch request
+RENDER_WORKERS = 4  # Event card images rendered in parallel
+SEND_INTERVAL = 0.5  # Minimum seconds between WhatsApp sends
+
+# First line of the calendar event details, by event type
+EVENT_HEADER_TOURNAMENT = "🏆 TURNIER"
+EVENT_HEADER_MATCH = "⚽ TESTSPIEL / GEGNER GESUCHT"
+
+# Per-group watermarks (newest analyzed message, so later runs only analyze
+# new ones) and per-calendar event snapshots (see sync_events)
+CACHE_DIR = Path.home() / ".cache" / "whatsapp-sync"
+
+# Second-precision ISO timestamp prefix, comparable as a string
+ISO_SECONDS_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+# Phone number formatting characters, removed before comparing numbers
+PHONE_STRIP = str.maketrans('', '', ' -()+./')
 
 # German weekday names
-WEEKDAYS_DE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+WEEKDAYS_DE = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
+
+# Target width for consistent WhatsApp bubble size (using invisible braille
+# pattern blank). Must be wider than longest possible content line (location
+# can be long).
+TARGET_WIDTH = 55
+FILLER_CHAR = "\u2800"  # Braille pattern blank - invisible but takes space
+PADDING_LINE = FILLER_CHAR * TARGET_WIDTH
+
+# Line under the organizer name in event messages
+SEPARATOR_LINE = "─" * 17
+
+# First and last moment of a day, for calendar time ranges
+DAY_START = datetime.min.time()
+DAY_END = datetime.max.time()
 
 
 def format_messages_for_ai(messages, sender_phones: dict = None) -> str:
@@ -42,7 +78,7 @@ def format_messages_for_ai(messages, sender_phones: dict = None) -> str:
             ts = datetime.fromisoformat(msg.timestamp.replace("Z", "+00:00"))
             if ts.tzinfo:
                 ts = ts.replace(tzinfo=None)
-            date_str = ts.strftime("%d.%m.%Y %H:%M")
+            date_str = f"{ts.day:02d}.{ts.month:02d}.{ts.year} {ts.hour:02d}:{ts.minute:02d}"
         except:
             date_str = "Unknown"
         
@@ -58,6 +94,42 @@ def format_messages_for_ai(messages, sender_phones: dict = None) -> str:
     return "\n---\n".join(formatted)
 
 
+def timestamp_key(timestamp: str) -> str | None:
+    """
+    Get a message timestamp as a sortable 'YYYY-MM-DDTHH:MM:SS' string.
+    
+    Like the parsed timestamps elsewhere, any UTC offset is dropped rather
+    than applied. Returns None for timestamps that can't be parsed.
+    """
+    try:
+        key = timestamp[:19]
+        if ISO_SECONDS_PATTERN.fullmatch(key):
+            return key
+        ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        return ts.replace(tzinfo=None).isoformat(timespec='seconds')
+    except (TypeError, ValueError):
+        return None
+
+
+def load_watermark(group_jid: str) -> str | None:
+    """Get the timestamp key of the newest message a previous run synced."""
+    try:
+        with open(CACHE_DIR / f"{group_jid}.watermark", encoding='utf-8') as f:
+            return json.load(f).get('ts')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def save_watermark(group_jid: str, ts: str):
+    """Remember the timestamp key of the newest synced message."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_DIR / f"{group_jid}.watermark", 'w', encoding='utf-8') as f:
+            json.dump({'ts': ts}, f)
+    except OSError as e:
+        print(f"  ⚠️  Could not save watermark: {e}")
+
+
 def get_calendar_service():
     """Get Google Calendar service."""
     from src.gcalendar import get_calendar_service as _get_service
@@ -70,64 +142,192 @@ def get_or_create_calendar(service, name: str) -> str | None:
     return _get_or_create(service, name)
 
 
-def get_existing_events(service, calendar_id: str, start_date: date, end_date: date) -> list[dict]:
-    """Get existing events in date range."""
-    from googleapiclient.errors import HttpError
+def list_events(service, calendar_id: str, time_min: str, time_max: str, fields: str) -> list[dict]:
+    """
+    List all events in a time range, following pagination.
     
-    try:
-        time_min = datetime.combine(start_date, datetime.min.time()).isoformat() + 'Z'
-        time_max = datetime.combine(end_date, datetime.max.time()).isoformat() + 'Z'
-        
+    fields selects the event fields to return (partial response), e.g.
+    "id,summary"; everything else is left out of the response.
+    """
+    items = []
+    page_token = None
+    
+    while True:
         result = service.events().list(
             calendarId=calendar_id,
             timeMin=time_min,
             timeMax=time_max,
             maxResults=500,
-            singleEvents=True
+            singleEvents=True,
+            pageToken=page_token,
+            fields=f"items({fields}),nextPageToken"
+        ).execute()
+        
+        items.extend(result.get('items', []))
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            return items
+
+
+def sync_events(service, calendar_id: str) -> dict[str, dict]:
+    """
+    Get all events of a calendar by id, from a local incrementally synced copy.
+    
+    The copy and Google's sync token are kept in the cache directory. Each
+    call only fetches events changed since the last one; the first call, or
+    one after Google expired the token (410 Gone), fetches everything.
+    Events only carry the fields is_duplicate needs.
+    """
+    from googleapiclient.errors import HttpError
+    
+    state_file = CACHE_DIR / f"{calendar_id}.synctoken"
+    try:
+        with open(state_file, encoding='utf-8') as f:
+            state = json.load(f)
+        sync_token, events = state['token'], state['events']
+    except (OSError, ValueError, KeyError, TypeError):
+        sync_token, events = None, {}
+    
+    try:
+        changes, next_token = fetch_event_changes(service, calendar_id, sync_token)
+    except HttpError as e:
+        if sync_token is None or e.resp.status != 410:
+            raise
+        events = {}
+        changes, next_token = fetch_event_changes(service, calendar_id, None)
+    
+    for event in changes:
+        if event.get('status') == 'cancelled':
+            events.pop(event['id'], None)
+        else:
+            events[event['id']] = event
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump({'token': next_token, 'events': events}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"  ⚠️  Could not save calendar snapshot: {e}")
+    
+    return events
+
+
+def fetch_event_changes(service, calendar_id: str, sync_token: str | None) -> tuple[list[dict], str | None]:
+    """
+    List events changed since sync_token (all events if None), following pagination.
+    
+    Returns the changed events - deleted ones with status 'cancelled' - and
+    the sync token for the next call.
+    """
+    items = []
+    page_token = None
+    
+    while True:
+        result = service.events().list(
+            calendarId=calendar_id,
+            maxResults=500,
+            singleEvents=True,
+            showDeleted=sync_token is not None,
+            syncToken=sync_token,
+            pageToken=page_token,
+            fields=(
+                "items(id,status,summary,description,location,start(date,dateTime)),"
+                "nextPageToken,nextSyncToken"
+            )
         ).execute()
         
-        return result.get('items', [])
+        items.extend(result.get('items', []))
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            return items, result.get('nextSyncToken')
+
+
+def get_existing_events(service, calendar_id: str, start_date: date, end_date: date) -> list[dict]:
+    """Get existing events in date range (only the fields is_duplicate needs)."""
+    from googleapiclient.errors import HttpError
+    
+    try:
+        events = sync_events(service, calendar_id)
     except HttpError as e:
         print(f"  ⚠️  Error fetching events: {e}")
         return []
+    
+    first, last = start_date.isoformat(), end_date.isoformat()
+    in_range = []
+    for event in events.values():
+        event_start = event.get('start', {})
+        event_date = event_start.get('date') or event_start.get('dateTime', '')[:10]
+        if first <= event_date <= last:
+            in_range.append(event)
+    return in_range
+
+
+@dataclass(slots=True)
+class ExistingEvent:
+    """Calendar event fields used by is_duplicate, lowercased once."""
+    title: str
+    description: str
+    description_compact: str  # Without PHONE_STRIP characters, for phone matching
+    location: str
+
+
+def add_existing_event(index: dict[str, list[ExistingEvent]], existing: dict):
+    """Add a Google Calendar event to a duplicate check index."""
+    existing_start = existing.get('start', {})
+    existing_date = existing_start.get('date') or existing_start.get('dateTime', '')[:10]
+    description = existing.get('description', '').lower()
+    
+    index.setdefault(existing_date, []).append(ExistingEvent(
+        title=existing.get('summary', '').lower(),
+        description=description,
+        description_compact=description.translate(PHONE_STRIP),
+        location=(existing.get('location') or '').lower()
+    ))
+
+
+def index_existing_events(existing_events: list[dict]) -> dict[str, list[ExistingEvent]]:
+    """Index Google Calendar events by ISO date for is_duplicate."""
+    index = {}
+    for existing in existing_events:
+        add_existing_event(index, existing)
+    return index
 
 
-def is_duplicate(event, existing_events: list[dict]) -> bool:
-    """Check if event already exists in calendar."""
+def is_duplicate(event, index: dict[str, list[ExistingEvent]]) -> bool:
+    """Check if event already exists in calendar (see index_existing_events)."""
     if not event.date:
         return False
     
-    event_date_str = event.date.isoformat()
+    candidates = index.get(event.date.isoformat())
+    if not candidates:
+        return False
     
-    for existing in existing_events:
-        existing_start = existing.get('start', {})
-        existing_date = existing_start.get('date') or existing_start.get('dateTime', '')[:10]
-        
-        if existing_date != event_date_str:
-            continue
-        
-        existing_title = existing.get('summary', '').lower()
-        existing_desc = existing.get('description', '').lower()
-        
+    org_lower = event.organizer.lower() if event.organizer else None
+    org_words = [word for word in org_lower.split() if len(word) > 3] if org_lower else []
+    phone_clean = (
+        event.contact_phone.translate(PHONE_STRIP)[-8:]
+        if event.contact_phone else None
+    )
+    location_prefix = event.location.lower()[:20] if event.location else None
+    
+    for existing in candidates:
         # Match by organizer
-        if event.organizer:
-            org_lower = event.organizer.lower()
-            if org_lower in existing_title or org_lower in existing_desc:
+        if org_lower:
+            if org_lower in existing.title or org_lower in existing.description:
                 return True
             # Check individual words
-            for word in org_lower.split():
-                if len(word) > 3 and word in existing_title:
+            for word in org_words:
+                if word in existing.title:
                     return True
         
         # Match by contact phone
-        if event.contact_phone and existing_desc:
-            phone_clean = event.contact_phone.replace(' ', '').replace('-', '')[-8:]
-            if phone_clean in existing_desc.replace(' ', '').replace('-', ''):
+        if phone_clean and existing.description:
+            if phone_clean in existing.description_compact:
                 return True
         
         # Match by location
-        if event.location and existing.get('location'):
-            if event.location.lower()[:20] in existing.get('location', '').lower():
+        if location_prefix and existing.location:
+            if location_prefix in existing.location:
                 return True
     
     return False
@@ -135,39 +335,24 @@ def is_duplicate(event, existing_events: list[dict]) -> bool:
 
 def create_calendar_event(event) -> dict:
     """Create Google Calendar event from extracted Event."""
+    is_tournament = event.event_type == "tournament"
+    
     # Title
-    emoji = "🏆" if event.event_type == "tournament" else "⚽"
-    title = f"{emoji} {event.organizer or 'Fußball Event'}"
+    title = f"{'🏆' if is_tournament else '⚽'} {event.organizer or 'Fußball Event'}"
     if event.age_group:
         title += f" ({event.age_group})"
     
-    # Description - use AI summary
-    desc_parts = []
-    
-    # Add AI summary at the top
-    if event.summary:
-        desc_parts.append(event.summary)
-        desc_parts.append("")
-    
-    if event.event_type == "tournament":
-        desc_parts.append("🏆 TURNIER")
-    else:
-        desc_parts.append("⚽ TESTSPIEL / GEGNER GESUCHT")
-    
-    if event.skill_level:
-        desc_parts.append(f"Stärke: {event.skill_level}/10")
-    if event.age_group:
-        desc_parts.append(f"Altersklasse: {event.age_group}")
-    if event.entry_fee:
-        desc_parts.append(f"Startgebühr: {event.entry_fee}€")
-    if event.contact_name:
-        desc_parts.append(f"Kontakt: {event.contact_name}")
-    if event.contact_phone:
-        desc_parts.append(f"📞 {event.contact_phone}")
-    if event.status == "full":
-        desc_parts.append("❌ AUSGEBUCHT")
-    
-    description = "\n".join(desc_parts)
+    # Description - event details, below the AI summary if there is one
+    details = "\n".join(filter(None, (
+        EVENT_HEADER_TOURNAMENT if is_tournament else EVENT_HEADER_MATCH,
+        event.skill_level and f"Stärke: {event.skill_level}/10",
+        event.age_group and f"Altersklasse: {event.age_group}",
+        event.entry_fee and f"Startgebühr: {event.entry_fee}€",
+        event.contact_name and f"Kontakt: {event.contact_name}",
+        event.contact_phone and f"📞 {event.contact_phone}",
+        event.status == "full" and "❌ AUSGEBUCHT",
+    )))
+    description = f"{event.summary}\n\n{details}" if event.summary else details
     
     # Date/Time
     date_str = event.date.isoformat()
@@ -208,6 +393,35 @@ def add_event_to_calendar(service, calendar_id: str, cal_event: dict) -> str | N
         return None
 
 
+def batch_add_events_to_calendar(service, calendar_id: str, cal_events: list[dict]) -> list[str | None]:
+    """
+    Add events to Google Calendar in batch requests.
+    
+    Returns the created event IDs in the order of cal_events, None for
+    events that failed.
+    """
+    from googleapiclient.errors import HttpError
+    
+    event_ids = [None] * len(cal_events)
+    
+    def callback(request_id, response, exception):
+        if exception is None:
+            event_ids[int(request_id)] = response.get('id')
+        else:
+            print(f"  ⚠️  Error creating event: {exception}")
+    
+    for start in range(0, len(cal_events), CALENDAR_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for i, cal_event in enumerate(cal_events[start:start + CALENDAR_BATCH_SIZE], start):
+            batch.add(service.events().insert(calendarId=calendar_id, body=cal_event), request_id=str(i))
+        try:
+            batch.execute()
+        except HttpError as e:
+            print(f"  ⚠️  Error creating events: {e}")
+    
+    return event_ids
+
+
 def cleanup_past_events(service, calendar_id: str, days_back: int = 60, dry_run: bool = False) -> int:
     """Delete past events from calendar using batch requests."""
     from googleapiclient.errors import HttpError
@@ -216,18 +430,13 @@ def cleanup_past_events(service, calendar_id: str, days_back: int = 60, dry_run:
     start_date = today - timedelta(days=days_back)
     
     try:
-        time_min = datetime.combine(start_date, datetime.min.time()).isoformat() + 'Z'
-        time_max = datetime.combine(today - timedelta(days=1), datetime.max.time()).isoformat() + 'Z'
+        time_min = datetime.combine(start_date, DAY_START).isoformat() + 'Z'
+        time_max = datetime.combine(today - timedelta(days=1), DAY_END).isoformat() + 'Z'
         
-        result = service.events().list(
-            calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            maxResults=500,
-            singleEvents=True
-        ).execute()
-        
-        past_events = result.get('items', [])
+        past_events = list_events(
+            service, calendar_id, time_min, time_max,
+            "id,summary,start(date,dateTime)"
+        )
     except HttpError:
         return 0
     
@@ -247,10 +456,11 @@ def cleanup_past_events(service, calendar_id: str, days_back: int = 60, dry_run:
         if exception is None or (hasattr(exception, 'resp') and exception.resp.status == 410):
             deleted += 1
     
-    batch = service.new_batch_http_request(callback=callback)
-    for event in past_events:
-        batch.add(service.events().delete(calendarId=calendar_id, eventId=event['id']))
-    batch.execute()
+    for start in range(0, len(past_events), CALENDAR_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for event in past_events[start:start + CALENDAR_BATCH_SIZE]:
+            batch.add(service.events().delete(calendarId=calendar_id, eventId=event['id']))
+        batch.execute()
     
     return deleted
 
@@ -260,33 +470,24 @@ def get_week_start(d: date) -> date:
     return d - timedelta(days=d.weekday())
 
 
-def group_events_by_week(events) -> dict:
-    """Group events by week (Monday-Sunday)."""
-    weeks = {}
-    
-    for event in events:
-        if not event.date:
-            continue
-        
-        week_start = get_week_start(event.date)
-        week_key = week_start.isoformat()
-        
-        if week_key not in weeks:
-            weeks[week_key] = []
-        weeks[week_key].append(event)
+def group_events_by_week(sorted_events) -> dict:
+    """
+    Group events by week (Monday-Sunday).
     
-    # Sort by date
-    return dict(sorted(weeks.items()))
+    Events must already be sorted by date; weeks and the events in them
+    keep that order.
+    """
+    dated = (event for event in sorted_events if event.date)
+    return {
+        week_key: list(week_events)
+        for week_key, week_events in groupby(dated, key=lambda e: get_week_start(e.date).isoformat())
+    }
 
 
 def format_event_message(event) -> str:
     """Format a single event as a WhatsApp message with consistent width."""
-    weekday = WEEKDAYS_DE[event.date.weekday()]
-    
-    # Target width for consistent bubble size (using invisible braille pattern blank)
-    # Must be wider than longest possible content line (location can be long)
-    TARGET_WIDTH = 55
-    FILLER_CHAR = "\u2800"  # Braille pattern blank - invisible but takes space
+    d = event.date
+    weekday = WEEKDAYS_DE[d.weekday()]
     
     lines = []
     
@@ -295,10 +496,10 @@ def format_event_message(event) -> str:
         lines.append(f"*{event.organizer}*")
     else:
         lines.append("*Termin*")
-    lines.append("─────────────────")
+    lines.append(SEPARATOR_LINE)
     
     # Date with calendar emoji
-    lines.append(f"* 📅 {event.date.strftime('%d.%m.%Y')}, {weekday}")
+    lines.append(f"* 📅 {d.day:02d}.{d.month:02d}.{d.year}, {weekday}")
     
     # Time on separate line
     if event.time_start:
@@ -324,8 +525,7 @@ def format_event_message(event) -> str:
         lines.append("* ❌ AUSGEBUCHT")
     
     # Add invisible padding line to ensure consistent bubble width
-    padding_line = FILLER_CHAR * TARGET_WIDTH
-    lines.append(padding_line)
+    lines.append(PADDING_LINE)
     
     return "\n".join(lines)
 
@@ -335,14 +535,12 @@ def format_week_header(week_start: date) -> str:
     week_num = week_start.isocalendar()[1]
     week_end = week_start + timedelta(days=6)
     
-    # Target width for consistent bubble size
-    TARGET_WIDTH = 55
-    FILLER_CHAR = "\u2800"
+    header = (
+        f"📅 *KW {week_num}: {week_start.day:02d}.{week_start.month:02d}. - "
+        f"{week_end.day:02d}.{week_end.month:02d}.{week_end.year}*"
+    )
     
-    header = f"📅 *KW {week_num}: {week_start.strftime('%d.%m.')} - {week_end.strftime('%d.%m.%Y')}*"
-    padding = FILLER_CHAR * TARGET_WIDTH
-    
-    return f"{header}\n{padding}"
+    return f"{header}\n{PADDING_LINE}"
 
 
 def format_events_for_whatsapp(events) -> list[str]:
@@ -358,15 +556,14 @@ def format_events_for_whatsapp(events) -> list[str]:
     # Group by week
     weeks = group_events_by_week(sorted_events)
     
-    for week_key in sorted(weeks.keys()):
-        week_events = weeks[week_key]
+    for week_key, week_events in weeks.items():
         week_start = date.fromisoformat(week_key)
         
         # Add week header
         messages.append(format_week_header(week_start))
         
         # Add events for this week
-        for event in sorted(week_events, key=lambda e: (e.date, e.time_start or "")):
+        for event in week_events:
             msg = format_event_message(event)
             if msg:
                 messages.append(msg)
@@ -377,9 +574,9 @@ def format_events_for_whatsapp(events) -> list[str]:
 def send_to_whatsapp(client, group_name: str, events, dry_run: bool = False) -> int:
     """Send event images to WhatsApp group."""
     from src.whatsapp import find_group_by_name
-    from src.event_card import render_event_card, render_week_header
+    from src.event_card import CARD_CACHE_DIR, evict_card_cache, render_event_card, render_week_header
+    from concurrent.futures import ThreadPoolExecutor
     import time
-    import os
     
     group = find_group_by_name(client, group_name)
     if not group:
@@ -396,42 +593,48 @@ def send_to_whatsapp(client, group_name: str, events, dry_run: bool = False) ->
         return len(sorted_events)
     
     sent = 0
-    temp_files = []
     
-    try:
-        for week_key in sorted(weeks.keys()):
-            week_events = weeks[week_key]
+    # Render every image up front in the background, so the next image is
+    # usually ready by the time the previous send has finished. Cards from
+    # the shared render cache are kept; only temp-file fallbacks are deleted.
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as executor:
+        queue = []
+        for week_key, week_events in weeks.items():
             week_start = date.fromisoformat(week_key)
             
-            # Send week header image
-            print(f"  📅 Sending KW {week_start.isocalendar()[1]} header...")
-            header_img = render_week_header(week_start)
-            temp_files.append(header_img)
+            queue.append((
+                f"  📅 Sending KW {week_start.isocalendar()[1]} header...",
+                executor.submit(render_week_header, week_start, cache=True)
+            ))
+            for event in week_events:
+                queue.append((
+                    f"  🖼 Sending: {event.organizer or 'Event'}...",
+                    executor.submit(render_event_card, event, cache=True)
+                ))
+        
+        # Rate limit on send starts: a send that took longer than
+        # SEND_INTERVAL has already waited long enough
+        next_send = 0.0
+        for label, future in queue:
+            print(label)
+            image = future.result()
+            
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_send = time.monotonic() + SEND_INTERVAL
             
-            if client.send_image(group.jid, header_img):
+            if client.send_image(group.jid, image):
                 sent += 1
-            time.sleep(0.5)
             
-            # Send each event as image
-            for event in sorted(week_events, key=lambda e: (e.date, e.time_start or "")):
-                print(f"  🖼 Sending: {event.organizer or 'Event'}...")
-                event_img = render_event_card(event)
-                temp_files.append(event_img)
-                
-                if client.send_image(group.jid, event_img):
-                    sent += 1
-                time.sleep(0.5)
-        
-        print(f"  📤 Sent {sent} images to {group_name}")
-        return sent
+            if Path(image).parent != CARD_CACHE_DIR:
+                Path(image).unlink(missing_ok=True)
+    
+    # Trim the cache only after every card of this run has been sent
+    evict_card_cache()
     
-    finally:
-        # Cleanup temp files
-        for f in temp_files:
-            try:
-                os.unlink(f)
-            except:
-                pass
+    print(f"  📤 Sent {sent} images to {group_name}")
+    return sent
 
 
 def main():
@@ -443,6 +646,7 @@ def main():
     parser.add_argument('--cleanup', action='store_true', help='Delete past events from calendar')
     parser.add_argument('--post', action='store_true', help='Post events summary to WhatsApp Termine group')
     parser.add_argument('--notify-group', type=str, default=NOTIFY_GROUP, help='WhatsApp group for posting')
+    parser.add_argument('--full', action='store_true', help='Analyze all messages in range, not just new ones')
     args = parser.parse_args()
     
     print("=" * 60)
@@ -452,10 +656,11 @@ def main():
     if args.dry_run:
         print("🔍 DRY RUN MODE - No changes will be made\n")
     
-    # Import modules
+    # Import modules (AI and calendar modules are imported once needed)
     try:
-        from src.whatsapp import WacliClient, check_wacli, find_group_by_name, get_sender_phones
-        from src.ai_extractor import analyze_messages_with_ai
+        from src.whatsapp import (
+            WacliClient, check_wacli, find_group_by_name, get_sender_phones, prepare_sender_phones
+        )
     except ImportError as e:
         print(f"❌ Import error: {e}")
         return 1
@@ -476,7 +681,7 @@ def main():
     
     # Refresh groups
     print("  🔄 Refreshing groups...")
-    subprocess.run(["wacli", "groups", "refresh"], capture_output=True)
+    client.refresh_groups()
     
     # Find group
     group = find_group_by_name(client, args.group)
@@ -484,32 +689,36 @@ def main():
     if group:
         # Backfill message history to ensure we have recent messages
         print("  📥 Backfilling message history...")
-        subprocess.run(
-            ["wacli", "history", "backfill", "--chat", group.jid],
-            capture_output=True,
-            timeout=60
-        )
+        client.backfill_history(group.jid, timeout=60)
     if not group:
         print(f"❌ Group not found: {args.group}")
         return 1
     print(f"  ✅ Found: {group.name}")
     
+    # Open session.db for the phone lookup while wacli fetches messages
+    threading.Thread(target=prepare_sender_phones, daemon=True).start()
+    
     # Fetch messages
     print(f"\n📨 Fetching messages (last {args.days} days)...")
     messages = client.get_messages(group.jid, limit=500)
     
-    # Filter by date
-    cutoff = datetime.now() - timedelta(days=args.days)
+    # Messages up to the last run's newest one were already analyzed
+    watermark = None if args.full else load_watermark(group.jid)
+    if watermark:
+        print(f"  ⏩ Skipping messages analyzed before (up to {watermark})")
+    
+    # Filter by date - ISO timestamps compare correctly as strings
+    cutoff = (datetime.now() - timedelta(days=args.days)).isoformat(timespec='seconds')
     filtered = []
+    newest = None
     for msg in messages:
-        try:
-            ts = datetime.fromisoformat(msg.timestamp.replace("Z", "+00:00"))
-            if ts.tzinfo:
-                ts = ts.replace(tzinfo=None)
-            if ts >= cutoff and msg.text:  # Only filter by time, let AI handle relevance
-                filtered.append(msg)
-        except:
-            pass
+        ts = timestamp_key(msg.timestamp)
+        if not ts or ts < cutoff or (watermark and ts <= watermark):
+            continue
+        if msg.text:  # Only filter by time, let AI handle relevance
+            filtered.append(msg)
+        if newest is None or ts > newest:
+            newest = ts
     
     print(f"  📥 {len(filtered)} messages in date range")
     
@@ -522,17 +731,31 @@ def main():
     sender_phones = get_sender_phones(msg_ids)
     print(f"  📞 Retrieved {len(sender_phones)} sender phone numbers")
     
+    try:
+        from src.ai_extractor import analyze_messages_with_ai
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        return 1
+    
     # Format messages for AI
     print("\n🤖 Analyzing messages with AI (Gemini)...")
     messages_text = format_messages_for_ai(filtered, sender_phones)
     
     # Call AI to extract events
-    events = analyze_messages_with_ai(messages_text)
+    events, complete = analyze_messages_with_ai(messages_text)
     
     print(f"\n  🎯 AI found {len(events)} events")
     
+    # A failed chunk keeps the old watermark, so its messages are retried
+    # on the next run instead of being filtered out for good
+    advance_watermark = complete and not args.dry_run
+    if not complete:
+        print("  ⚠️  Some AI chunks failed, watermark will not be advanced")
+    
     if not events:
         print("  ℹ️  No events found in messages")
+        if advance_watermark:
+            save_watermark(group.jid, newest)
         return 0
     
     # Filter future events
@@ -545,6 +768,8 @@ def main():
     
     if not future_events:
         print("  ℹ️  No future events to sync")
+        if advance_watermark:
+            save_watermark(group.jid, newest)
         return 0
     
     # Show found events
@@ -583,40 +808,54 @@ def main():
     max_date = max(e.date for e in future_events) + timedelta(days=1)
     existing = get_existing_events(service, calendar_id, min_date, max_date)
     print(f"\n  🔍 Checking duplicates ({len(existing)} existing events)...")
+    existing_index = index_existing_events(existing)
     
     # Add events
     added = 0
     skipped = 0
     
+    to_add = []
+    
     for evt in future_events:
-        if is_duplicate(evt, existing):
+        if is_duplicate(evt, existing_index):
             print(f"  ⏭️  Skipped (duplicate): {evt.date} - {evt.organizer or 'Event'}")
             skipped += 1
             continue
         
         # Create calendar event with AI summary
         cal_event = create_calendar_event(evt)
+        to_add.append((evt, cal_event))
         
-        if args.dry_run:
+        # Add to existing for duplicate check within this run
+        add_existing_event(existing_index, {
+            'start': {'date': evt.date.isoformat()},
+            'summary': cal_event['summary'],
+            'description': cal_event['description'],
+            'location': cal_event.get('location', '')
+        })
+    
+    if args.dry_run:
+        for evt, _ in to_add:
             print(f"  📝 Would add: {evt.date} - {evt.organizer or 'Event'}")
-            added += 1
-        else:
-            event_id = add_event_to_calendar(service, calendar_id, cal_event)
+        added = len(to_add)
+    elif to_add:
+        # One round trip per CALENDAR_BATCH_SIZE events instead of one per event
+        event_ids = batch_add_events_to_calendar(service, calendar_id, [cal_event for _, cal_event in to_add])
+        for (evt, _), event_id in zip(to_add, event_ids):
             if event_id:
                 print(f"  ✅ Added: {evt.date} - {evt.organizer or 'Event'}")
                 added += 1
-                # Add to existing for duplicate check within batch
-                existing.append({
-                    'start': {'date': evt.date.isoformat()},
-                    'summary': cal_event['summary'],
-                    'description': cal_event['description'],
-                    'location': cal_event.get('location', '')
-                })
     
     print(f"\n{'=' * 60}")
     print(f"✅ Calendar sync done! Added: {added}, Skipped: {skipped}")
     print("=" * 60)
     
+    # Failed inserts keep the old watermark too
+    if not args.dry_run and added < len(to_add):
+        print(f"  ⚠️  {len(to_add) - added} event(s) failed, watermark not advanced")
+    elif advance_watermark:
+        save_watermark(group.jid, newest)
+    
     # Post to WhatsApp (always enabled) - send as images
     if future_events:
         print(f"\n📱 Posting event images to WhatsApp '{args.notify_group}'...")